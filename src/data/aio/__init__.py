@@ -0,0 +1 @@
+"""Async versions of the data modules, backed by aiosqlite"""
@@ -0,0 +1,83 @@
+from .init import get_conn, IntegrityError
+from model.creature import Creature
+from ..creature import row_to_model, model_to_dict
+from ..errors import MissingException, DuplicateException
+
+async def get_one(name: str) -> Creature:
+    if not name: return None
+
+    qry = "select * from creature where name=:name"
+    params = {"name": name}
+    async with get_conn(read_only=True) as conn:
+        async with conn.execute(qry, params) as curs:
+            row = await curs.fetchone()
+
+    if not row:
+        raise MissingException(
+            f"Creature {name} not found"
+        )
+
+    return row_to_model(row)
+
+async def get_all() -> list[Creature]:
+    qry = "select * from creature"
+    async with get_conn(read_only=True) as conn:
+        rows = await conn.execute_fetchall(qry)
+    return [row_to_model(row) for row in rows]
+
+async def create(creature: Creature) -> Creature:
+    if not creature: return None
+
+    qry = """insert into creature (name, description, country, area, aka) values (:name, :description, :country, :area, :aka)
+             returning *"""
+    params = model_to_dict(creature)
+
+    async with get_conn() as conn:
+        try:
+            async with conn.execute(qry, params) as curs:
+                row = await curs.fetchone()
+        except IntegrityError:
+            raise DuplicateException(
+                f"Creature {creature.name} already exists"
+            )
+
+        await conn.commit()
+
+    return row_to_model(row)
+
+async def modify(creature: Creature) -> Creature:
+    qry = """update creature
+             set country=:country,
+                 name=:name,
+                 description=:description,
+                 area=:area,
+                 aka=:aka
+             where name=:name_orig
+             returning *"""
+    params = model_to_dict(creature)
+    params["name_orig"] = creature.name
+    async with get_conn() as conn:
+        async with conn.execute(qry, params) as curs:
+            row = await curs.fetchone()
+
+        if not row:
+            raise MissingException(msg=f"Creature {creature.name} not found")
+        await conn.commit()
+
+    return row_to_model(row)
+
+async def delete(name: str) -> bool:
+    if not name: return False
+
+    qry = "delete from creature where name = :name"
+    params = {"name": name}
+    async with get_conn() as conn:
+        curs = await conn.execute(qry, params)
+
+        if curs.rowcount != 1:
+            raise MissingException(
+                f"Creature {name} not found"
+            )
+        await conn.commit()
+
+    return True
@@ -0,0 +1,82 @@
+from .init import get_conn, IntegrityError
+from model.explorer import Explorer
+from ..explorer import row_to_model, model_to_dict
+from ..errors import MissingException, DuplicateException
+
+async def get_one(name: str) -> Explorer:
+    if not name: return None
+
+    qry = "select * from explorer where name=:name"
+    params = {"name": name}
+    async with get_conn(read_only=True) as conn:
+        async with conn.execute(qry, params) as curs:
+            row = await curs.fetchone()
+
+    if not row:
+        raise MissingException(
+            f"Explorer {name} not found"
+        )
+
+    return row_to_model(row)
+
+async def get_all() -> list[Explorer]:
+    qry = "select * from explorer"
+    async with get_conn(read_only=True) as conn:
+        rows = await conn.execute_fetchall(qry)
+    return [row_to_model(row) for row in rows]
+
+async def create(explorer: Explorer) -> Explorer | None:
+    if not explorer: return None
+    qry = """insert into explorer (name, country, description)
+             values (:name, :country, :description)
+             returning *"""
+    params = model_to_dict(explorer)
+
+    async with get_conn() as conn:
+        try:
+            async with conn.execute(qry, params) as curs:
+                row = await curs.fetchone()
+        except IntegrityError:
+            raise DuplicateException(
+                f"Explorer {explorer.name} already exists"
+            )
+
+        await conn.commit()
+
+    return row_to_model(row)
+
+async def modify(explorer: Explorer) -> Explorer | None:
+    if not explorer: return None
+    qry = """update explorer
+             set country=:country,
+             name=:name,
+             description=:description
+             where name=:name_orig
+             returning *"""
+    params = model_to_dict(explorer)
+    params["name_orig"] = explorer.name
+    async with get_conn() as conn:
+        async with conn.execute(qry, params) as curs:
+            row = await curs.fetchone()
+
+        if not row:
+            raise MissingException(msg=f"Explorer {explorer.name} not found")
+        await conn.commit()
+
+    return row_to_model(row)
+
+async def delete(name: str) -> bool:
+    if not name: return False
+
+    qry = "delete from explorer where name = :name"
+    params = {"name": name}
+    async with get_conn() as conn:
+        curs = await conn.execute(qry, params)
+
+        if curs.rowcount != 1:
+            raise MissingException(
+                f"Explorer {name} not found"
+            )
+        await conn.commit()
+
+    return True
@@ -0,0 +1,113 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+import aiosqlite
+from sqlite3 import IntegrityError
+from .. import init
+
+class AsyncConnectionPool:
+    """Async counterpart of data.init.ConnectionPool.
+
+    Each aiosqlite connection runs its queries on its own thread, so
+    the event loop only awaits results instead of blocking on SQLite.
+    Connections are opened on first use, inside the running loop.
+    """
+    def __init__(self, name: str, uri: bool = False,
+                 size: int = init.POOL_SIZE,
+                 timeout: float = init.POOL_TIMEOUT) -> None:
+        self.name = name
+        self.uri = uri
+        self.size = max(size, 1)
+        self.timeout = timeout
+        self._writer: aiosqlite.Connection | None = None
+        # Created inside the running loop by _open(), not at import
+        self._write_lock: asyncio.Lock | None = None
+        self._readers: asyncio.Queue[aiosqlite.Connection] | None = None
+        self._open_lock: asyncio.Lock | None = None
+        self._all: list[aiosqlite.Connection] = []
+
+    async def _connect(self, read_only: bool = False) -> aiosqlite.Connection:
+        conn = await aiosqlite.connect(self.name, uri=self.uri,
+                                       timeout=init.BUSY_TIMEOUT_MS / 1000,
+                                       factory=init.TimedConnection)
+        await conn.execute(f"pragma busy_timeout = {init.BUSY_TIMEOUT_MS}")
+        if read_only:
+            await conn.execute("pragma query_only = on")
+            if self.uri:
+                await conn.execute("pragma read_uncommitted = on")
+        self._all.append(conn)
+        return conn
+
+    async def _open(self) -> None:
+        if not self._open_lock:
+            self._open_lock = asyncio.Lock()
+        async with self._open_lock:
+            if self._writer:
+                return
+            self._write_lock = asyncio.Lock()
+            self._readers = asyncio.Queue()
+            for _ in range(self.size):
+                self._readers.put_nowait(await self._connect(read_only=True))
+            self._writer = await self._connect()
+
+    @asynccontextmanager
+    async def connection(self, read_only: bool = False) -> AsyncIterator[aiosqlite.Connection]:
+        """Check out a connection for the length of an async with block"""
+        if not self._writer:
+            await self._open()
+        if not read_only:
+            try:
+                await asyncio.wait_for(self._write_lock.acquire(), self.timeout)
+            except asyncio.TimeoutError:
+                raise init.PoolTimeout(msg="Timed out waiting for the writer connection")
+            try:
+                yield self._writer
+            finally:
+                if self._writer.in_transaction:
+                    await self._writer.rollback()
+                self._write_lock.release()
+            return
+
+        try:
+            conn = await asyncio.wait_for(self._readers.get(), self.timeout)
+        except asyncio.TimeoutError:
+            raise init.PoolTimeout(msg="Timed out waiting for a read connection")
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                await conn.rollback()
+            self._readers.put_nowait(conn)
+
+    async def close(self) -> None:
+        """Close every connection; the next connection() reopens them"""
+        for conn in self._all:
+            await conn.close()
+        self._all.clear()
+        self._writer = None
+        self._write_lock = self._readers = self._open_lock = None
+
+pool: AsyncConnectionPool | None = None
+
+def get_db(reset: bool = False):
+    """Set up the async pool on the same database as data.init"""
+    global pool
+    if pool and not reset:
+        return
+    init.get_db()
+    pool = AsyncConnectionPool(init.pool.name, uri=init.pool.uri)
+
+def get_conn(read_only: bool = False):
+    """Borrow a pooled connection: async with get_conn() as conn: ...
+    The pool is set up on first use."""
+    if not pool:
+        get_db()
+    return pool.connection(read_only=read_only)
+
+async def close_db() -> None:
+    """Close every open async connection; the next get_conn() sets up
+    the pool again, on whatever database data.init has open then"""
+    global pool
+    if pool:
+        await pool.close()
+        pool = None
@@ -0,0 +1,66 @@
+from model.user import User
+from .init import (get_conn, IntegrityError)
+from ..user import row_to_model, model_to_dict
+from ..errors import MissingException, DuplicateException
+
+async def get_one(name: str) -> User:
+    qry = "select * from user where name=:name"
+    params = {"name": name}
+    async with get_conn(read_only=True) as conn:
+        async with conn.execute(qry, params) as curs:
+            row = await curs.fetchone()
+    if row:
+        return row_to_model(row)
+    else:
+        raise MissingException(msg=f"User {name} not found")
+
+async def get_all() -> list[User]:
+    qry = "select * from user"
+    async with get_conn(read_only=True) as conn:
+        rows = await conn.execute_fetchall(qry)
+    return [row_to_model(row) for row in rows]
+
+async def create(user: User, table:str = "user"):
+    qry = f"""insert into {table}
+        (name, hashed_passwd, salt)
+        values
+        (:name, :hashed_passwd, :salt)"""
+    params = model_to_dict(user)
+    async with get_conn() as conn:
+        try:
+            await conn.execute(qry, params)
+            await conn.commit()
+            return user
+        except IntegrityError:
+            raise DuplicateException(msg=
+                f"{table}: user {user.name} already exists")
+
+async def modify(name: str, passwd: str)  -> User:
+    qry = """update user set
+             name=:name, hashed_passwd=:hashed_passwd
+             where name=:name0
+             returning *"""
+    params = {
+        "name": name,
+        "hashed_passwd": passwd,
+        "name0": name}
+    async with get_conn() as conn:
+        async with conn.execute(qry, params) as curs:
+            row = await curs.fetchone()
+        await conn.commit()
+    if row:
+        return row_to_model(row)
+    else:
+        raise MissingException(msg=f"User {name} not found")
+
+async def delete(name: str) -> None:
+    """Drop user with <name> from user table, add to xuser table"""
+    user = await get_one(name)
+    qry = "delete from user where name = :name"
+    params = {"name": name}
+    async with get_conn() as conn:
+        curs = await conn.execute(qry, params)
+        await conn.commit()
+    if curs.rowcount != 1:
+        raise MissingException(msg=f"User {name} not found")
+    await create(user, table="xuser")
@@ -0,0 +1,52 @@
+import os
+from .init import get_conn, chunked, MAX_VARIABLES
+
+BATCH_SIZE = int(os.getenv("CRYPTID_BULK_BATCH_SIZE", "500"))
+
+def get_many(table: str, columns: tuple[str, ...], names: list[str]) -> list[tuple]:
+    """Return the rows of <table> named in <names>, in no particular
+    order, with one IN query per MAX_VARIABLES names"""
+    rows = []
+    with get_conn(read_only=True) as conn:
+        for batch in chunked(names, MAX_VARIABLES):
+            marks = ", ".join("?" * len(batch))
+            rows += conn.execute(
+                f"select {', '.join(columns)} from {table} where name in ({marks})",
+                batch).fetchall()
+    return rows
+
+def create_many(table: str, columns: tuple[str, ...], rows: list[dict],
+                upsert: bool = False) -> list[str]:
+    """Insert <rows> into <table> in a single transaction.
+
+    Returns "created", "updated" or "duplicate" for each row, in order.
+    Without <upsert>, rows whose name already exists are left alone;
+    with it they overwrite the stored row.
+    """
+    if upsert:
+        updates = ", ".join(f"{col}=excluded.{col}"
+                            for col in columns if col != "name")
+        conflict = f"do update set {updates}"
+    else:
+        conflict = "do nothing"
+    qry = f"""insert into {table} ({', '.join(columns)})
+              values ({', '.join(':' + col for col in columns)})
+              on conflict(name) {conflict}"""
+    repeat = "updated" if upsert else "duplicate"
+
+    statuses = []
+    seen = set()
+    with get_conn() as conn:
+        for batch in chunked(rows, min(BATCH_SIZE, MAX_VARIABLES)):
+            names = [row["name"] for row in batch]
+            marks = ", ".join("?" * len(names))
+            existing = {name for (name,) in conn.execute(
+                f"select name from {table} where name in ({marks})", names)}
+            for name in names:
+                statuses.append(repeat if name in existing or name in seen
+                                else "created")
+                seen.add(name)
+            conn.executemany(qry, batch)
+        conn.commit()
+
+    return statuses
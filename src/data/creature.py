@@ -1,18 +1,14 @@
-from .init import conn, curs, IntegrityError
+from typing import Iterator
+from .init import get_conn, Connection, IntegrityError
+from . import bulk, paging, search, version, writer
 from model.creature import Creature
 from .errors import MissingException, DuplicateException
 
-curs.execute(
-"""create table if not exists creature(
-                name text primary key,
-                description text,
-                country text,
-                area text,
-                aka text)"""
-)
+COLUMNS = ("name", "description", "country", "area", "aka")
 
 def row_to_model(row: tuple) -> Creature:
-    return Creature(
+    """Build a model from a trusted database row, without validation"""
+    return Creature.model_construct(
         name=row[0],
         description=row[1],
         country=row[2],
@@ -29,68 +25,92 @@ def get_one(name: str) -> Creature:
     qry = "select * from creature where name=:name"
     params = {"name": name}
 
-    curs.execute(qry, params)
+    with get_conn(read_only=True) as conn:
+        curs = conn.execute(qry, params)
+        row = curs.fetchone()
 
-    row = row_to_model(curs.fetchone())
-    
     if not row:
         raise MissingException(
             f"Creature {name} not found"
         )
     
-    return row
+    return row_to_model(row)
+
+def get_many(names: list[str]) -> list[Creature]:
+    """Return the creatures named in <names> that exist, in no particular order"""
+    return [row_to_model(row) for row in bulk.get_many("creature", COLUMNS, names)]
 
 def get_all() -> list[Creature]:
     qry = "select * from creature"
-    curs.execute(qry)
-    return [row_to_model(row) for row in curs.fetchall()]
+    with get_conn(read_only=True) as conn:
+        rows = conn.execute(qry).fetchall()
+    return [row_to_model(row) for row in rows]
 
-def create(creature: Creature) -> Creature:
-    if not creature: return None
+def get_page(after: str | None = None, limit: int | None = None,
+             fields: list[str] | None = None,
+             country: str | None = None,
+             area: str | None = None) -> tuple[list[dict], str | None]:
+    return paging.get_page("creature", COLUMNS, after=after, limit=limit,
+        fields=fields, filters={"country": country, "area": area})
 
-    qry = """insert into creature (name, description, country, area, aka) values (:name, :description, :country, :area, :aka)"""
-    params = model_to_dict(creature)
+def iter_chunks() -> Iterator[list[dict]]:
+    return paging.iter_chunks("creature", COLUMNS)
+
+def search_text(q: str, limit: int = 20, offset: int = 0) -> tuple[list[dict], bool]:
+    return search.search("creature", COLUMNS, q, limit=limit, offset=offset)
 
+def get_version() -> int:
+    return version.get_version("creature")
+
+def _create(conn: Connection, creature: Creature) -> Creature:
+    qry = """insert into creature (name, description, country, area, aka) values (:name, :description, :country, :area, :aka)
+             returning *"""
+    params = model_to_dict(creature)
     try:
-        curs.execute(qry, params)
+        row = conn.execute(qry, params).fetchone()
     except IntegrityError:
         raise DuplicateException(
             f"Creature {creature.name} already exists"
         )
-    
-    conn.commit()
+    return row_to_model(row)
 
-    return get_one(creature.name)
+def create(creature: Creature) -> Creature:
+    if not creature: return None
+    return writer.write(_create, creature)
 
-def modify(creature: Creature) -> Creature:
+def create_many(creatures: list[Creature], upsert: bool = False) -> list[str]:
+    rows = [model_to_dict(creature) for creature in creatures]
+    return bulk.create_many("creature", COLUMNS, rows, upsert=upsert)
+
+def _modify(conn: Connection, creature: Creature) -> Creature:
     qry = """update creature
              set country=:country,
                  name=:name,
                  description=:description,
                  area=:area,
                  aka=:aka
-             where name=:name_orig"""
+             where name=:name_orig
+             returning *"""
     params = model_to_dict(creature)
     params["name_orig"] = creature.name
-    curs.execute(qry, params)
-
-    if curs.rowcount == 1:
-        conn.commit()
-        return get_one(creature.name)
-    else:
+    row = conn.execute(qry, params).fetchone()
+    if not row:
         raise MissingException(msg=f"Creature {creature.name} not found")
+    return row_to_model(row)
 
-def delete(name: str) -> bool:
-    if not name: return False
+def modify(creature: Creature) -> Creature:
+    return writer.write(_modify, creature)
 
+def _delete(conn: Connection, name: str) -> bool:
     qry = "delete from creature where name = :name"
     params = {"name": name}
-    curs.execute(qry, params)
-
+    curs = conn.execute(qry, params)
     if curs.rowcount != 1:
         raise MissingException(
             f"Creature {name} not found"
         )
-    conn.commit()
-    
-    return True
\ No newline at end of file
+    return True
+
+def delete(name: str) -> bool:
+    if not name: return False
+    return writer.write(_delete, name)
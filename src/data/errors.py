@@ -4,4 +4,8 @@ class MissingException(Exception):
 
 class DuplicateException(Exception):
     def __init__(self, msg: str) -> None:
-        self.msg = msg
\ No newline at end of file
+        self.msg = msg
+
+class SearchException(Exception):
+    def __init__(self, msg: str) -> None:
+        self.msg = msg
@@ -1,14 +1,14 @@
-from .init import curs, conn, IntegrityError
+from typing import Iterator
+from .init import get_conn, Connection, IntegrityError
+from . import bulk, paging, search, version, writer
 from model.explorer import Explorer
 from .errors import MissingException, DuplicateException
 
-curs.execute("""create table if not exists explorer(
-                name text primary key,
-                country text,
-                description text)""")
+COLUMNS = ("name", "country", "description")
 
 def row_to_model(row: tuple) -> Explorer:
-    return Explorer(name=row[0], country=row[1], description=row[2])
+    """Build a model from a trusted database row, without validation"""
+    return Explorer.model_construct(name=row[0], country=row[1], description=row[2])
 
 def model_to_dict(explorer: Explorer) -> dict | None:
     return explorer.model_dump() if explorer else None
@@ -18,66 +18,90 @@ def get_one(name: str) -> Explorer:
 
     qry = "select * from explorer where name=:name"
     params = {"name": name}
-    curs.execute(qry, params)
+    with get_conn(read_only=True) as conn:
+        row = conn.execute(qry, params).fetchone()
 
-    row = row_to_model(curs.fetchone())
     if not row:
         raise MissingException(
             f"Explorer {name} not found"
         )
 
-    return row
+    return row_to_model(row)
+
+def get_many(names: list[str]) -> list[Explorer]:
+    """Return the explorers named in <names> that exist, in no particular order"""
+    return [row_to_model(row) for row in bulk.get_many("explorer", COLUMNS, names)]
 
 def get_all() -> list[Explorer]:
     qry = "select * from explorer"
-    curs.execute(qry)
-    return [row_to_model(row) for row in curs.fetchall()]
+    with get_conn(read_only=True) as conn:
+        rows = conn.execute(qry).fetchall()
+    return [row_to_model(row) for row in rows]
 
-def create(explorer: Explorer) -> Explorer | None:
-    if not explorer: return None
+def get_page(after: str | None = None, limit: int | None = None,
+             fields: list[str] | None = None,
+             country: str | None = None) -> tuple[list[dict], str | None]:
+    return paging.get_page("explorer", COLUMNS, after=after, limit=limit,
+        fields=fields, filters={"country": country})
+
+def iter_chunks() -> Iterator[list[dict]]:
+    return paging.iter_chunks("explorer", COLUMNS)
+
+def search_text(q: str, limit: int = 20, offset: int = 0) -> tuple[list[dict], bool]:
+    return search.search("explorer", COLUMNS, q, limit=limit, offset=offset)
+
+def get_version() -> int:
+    return version.get_version("explorer")
+
+def _create(conn: Connection, explorer: Explorer) -> Explorer:
     qry = """insert into explorer (name, country, description)
-             values (:name, :country, :description)"""
+             values (:name, :country, :description)
+             returning *"""
     params = model_to_dict(explorer)
-
     try:
-        curs.execute(qry, params)
+        row = conn.execute(qry, params).fetchone()
     except IntegrityError:
         raise DuplicateException(
             f"Explorer {explorer.name} already exists"
         )
-    
-    conn.commit()
-
-    return get_one(explorer.name)
+    return row_to_model(row)
 
-def modify(explorer: Explorer) -> Explorer | None:
+def create(explorer: Explorer) -> Explorer | None:
     if not explorer: return None
+    return writer.write(_create, explorer)
+
+def create_many(explorers: list[Explorer], upsert: bool = False) -> list[str]:
+    rows = [model_to_dict(explorer) for explorer in explorers]
+    return bulk.create_many("explorer", COLUMNS, rows, upsert=upsert)
+
+def _modify(conn: Connection, explorer: Explorer) -> Explorer:
     qry = """update explorer
              set country=:country,
              name=:name,
              description=:description
-             where name=:name_orig"""
+             where name=:name_orig
+             returning *"""
     params = model_to_dict(explorer)
     params["name_orig"] = explorer.name
-    curs.execute(qry, params)
-    
-    if curs.rowcount == 1:
-        conn.commit()
-        return get_one(explorer.name)
-    else:
+    row = conn.execute(qry, params).fetchone()
+    if not row:
         raise MissingException(msg=f"Explorer {explorer.name} not found")
+    return row_to_model(row)
 
-def delete(name: str) -> bool:
-    if not name: return False
+def modify(explorer: Explorer) -> Explorer | None:
+    if not explorer: return None
+    return writer.write(_modify, explorer)
 
+def _delete(conn: Connection, name: str) -> bool:
     qry = "delete from explorer where name = :name"
     params = {"name": name}
-    curs.execute(qry, params)
-
+    curs = conn.execute(qry, params)
     if curs.rowcount != 1:
         raise MissingException(
             f"Explorer {name} not found"
         )
-    conn.commit()
-    
-    return True
\ No newline at end of file
+    return True
+
+def delete(name: str) -> bool:
+    if not name: return False
+    return writer.write(_delete, name)
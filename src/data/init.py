@@ -1,20 +1,171 @@
 import os
+from contextlib import contextmanager
 from pathlib import Path
-from sqlite3 import connect, Connection, Cursor, IntegrityError
+from itertools import count, islice
+from queue import Empty, LifoQueue
+from threading import Lock
+from typing import Iterable, Iterator
+from time import perf_counter
+from sqlite3 import connect, Connection, IntegrityError
+from telemetry.metrics import DB_QUERY_LATENCY
+from telemetry.profiler import record_sql
 
-conn: Connection | None = None
-curs: Cursor | None = None
+POOL_SIZE = int(os.getenv("CRYPTID_SQLITE_POOL_SIZE", "8"))
+POOL_TIMEOUT = float(os.getenv("CRYPTID_SQLITE_POOL_TIMEOUT", "30"))
+BUSY_TIMEOUT_MS = int(os.getenv("CRYPTID_SQLITE_BUSY_TIMEOUT_MS", "5000"))
+# Most parameters one statement may bind (SQLITE_MAX_VARIABLE_NUMBER)
+MAX_VARIABLES = int(os.getenv("CRYPTID_SQLITE_MAX_VARIABLES", "999"))
 
-def get_db(reset: bool = False):
-    """Connect to SQLite database file"""
-    global conn, curs
-    if conn:
-        if not reset:
+_memory_ids = count()
+
+class PoolTimeout(Exception):
+    def __init__(self, msg: str) -> None:
+        self.msg = msg
+
+def statement_type(sql: str) -> str:
+    verb = sql.lstrip()[:6].lower()
+    return verb if verb in ("select", "insert", "update", "delete") else "other"
+
+class TimedConnection(Connection):
+    """Connection that records how long each statement spends in
+    execute(). Rows fetched later from the cursor are not included, so
+    for a select this is mostly the time to the first row."""
+    def execute(self, sql: str, *args):
+        record_sql(sql)
+        start = perf_counter()
+        try:
+            return super().execute(sql, *args)
+        finally:
+            DB_QUERY_LATENCY.observe(perf_counter() - start,
+                                     statement=statement_type(sql))
+
+    def executemany(self, sql: str, *args):
+        record_sql(sql)
+        start = perf_counter()
+        try:
+            return super().executemany(sql, *args)
+        finally:
+            DB_QUERY_LATENCY.observe(perf_counter() - start,
+                                     statement=statement_type(sql))
+
+class ConnectionPool:
+    """A fixed set of SQLite connections shared by worker threads.
+
+    Reads are spread over <size> read-only connections; writes go
+    through a single writer connection, since SQLite only lets one
+    writer in at a time anyway.
+    """
+    def __init__(self, name: str, size: int = POOL_SIZE,
+                 timeout: float = POOL_TIMEOUT) -> None:
+        self.name = name
+        self.timeout = timeout
+        self.uri = False
+        if name == ":memory:":
+            # Each plain :memory: connection would get its own empty
+            # database, so pooled connections share one by URI instead
+            self.name = f"file:cryptid-mem-{next(_memory_ids)}?mode=memory&cache=shared"
+            self.uri = True
+        self._writer = self._connect()
+        self._write_lock = Lock()
+        self._readers: LifoQueue[Connection] = LifoQueue()
+        for _ in range(max(size, 1)):
+            self._readers.put(self._connect(read_only=True))
+        self._all = [self._writer, *self._readers.queue]
+
+    def _connect(self, read_only: bool = False) -> Connection:
+        conn = connect(self.name, uri=self.uri, check_same_thread=False,
+                       timeout=BUSY_TIMEOUT_MS / 1000, factory=TimedConnection)
+        conn.execute(f"pragma busy_timeout = {BUSY_TIMEOUT_MS}")
+        conn.execute("pragma journal_mode = wal")
+        if read_only:
+            conn.execute("pragma query_only = on")
+            if self.uri:
+                # Shared-cache readers would otherwise take table locks
+                # that make the writer fail instead of wait
+                conn.execute("pragma read_uncommitted = on")
+        return conn
+
+    @contextmanager
+    def connection(self, read_only: bool = False) -> Iterator[Connection]:
+        """Check out a connection for the length of a with block"""
+        if not read_only:
+            if not self._write_lock.acquire(timeout=self.timeout):
+                raise PoolTimeout(msg="Timed out waiting for the writer connection")
+            try:
+                yield self._writer
+            finally:
+                if self._writer.in_transaction:
+                    self._writer.rollback()
+                self._write_lock.release()
             return
-        conn = None
 
-    name = os.getenv("CRYPTID_SQLITE_DB")
-    conn = connect(name, check_same_thread=False)
-    curs = conn.cursor()
+        try:
+            conn = self._readers.get(timeout=self.timeout)
+        except Empty:
+            raise PoolTimeout(msg="Timed out waiting for a read connection")
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._readers.put(conn)
+
+    def close(self) -> None:
+        for conn in self._all:
+            conn.close()
+
+def chunked(items: Iterable, size: int) -> Iterator[list]:
+    """Yield successive lists of up to <size> <items>"""
+    items = iter(items)
+    while (chunk := list(islice(items, size))):
+        yield chunk
+
+pool: ConnectionPool | None = None
+_pool_lock = Lock()
+
+def default_db() -> str:
+    """Return the database file to use when CRYPTID_SQLITE_DB is unset"""
+    src_dir = Path(__file__).resolve().parent.parent
+    return str(src_dir / "db" / (os.getenv("DB_NAME", "cryptid") + ".sqlite"))
+
+def get_db(reset: bool = False):
+    """Open the connection pool for the SQLite database file, and bring
+    its schema up to date"""
+    global pool
+    with _pool_lock:
+        if pool:
+            if not reset:
+                return
+            pool.close()
+            pool = None
+
+        name = os.getenv("CRYPTID_SQLITE_DB")
+        if not name:
+            name = default_db()
+            Path(name).parent.mkdir(exist_ok=True)
+        new_pool = ConnectionPool(name)
+
+        from .migrations import migrate
+        with new_pool.connection() as conn:
+            migrate(conn)
+        pool = new_pool
+
+def close_db():
+    """Close every pooled connection; the next get_conn() reopens them"""
+    global pool
+    with _pool_lock:
+        if pool:
+            pool.close()
+            pool = None
+
+def get_conn(read_only: bool = False):
+    """Borrow a pooled connection: with get_conn() as conn: ...
+    The pool is opened on first use."""
+    if not pool:
+        get_db()
+    return pool.connection(read_only=read_only)
 
-get_db()
\ No newline at end of file
+def explain(qry: str, params: dict | tuple = ()) -> list[str]:
+    """Return the EXPLAIN QUERY PLAN details for <qry>"""
+    with get_conn(read_only=True) as conn:
+        return [row[3] for row in conn.execute(f"explain query plan {qry}", params)]
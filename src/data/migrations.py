@@ -0,0 +1,69 @@
+"""Versioned schema migrations.
+
+The schema version lives in SQLite's user_version pragma. migrate()
+applies, in order and each in its own transaction, every step past the
+stored version; several workers may run it at once. Add new steps to
+the end of MIGRATIONS; never edit or reorder ones that have shipped.
+"""
+from sqlite3 import Connection
+from . import search, version
+
+def create_tables(conn: Connection) -> None:
+    conn.execute("""create table if not exists creature(
+                    name text primary key,
+                    description text,
+                    country text,
+                    area text,
+                    aka text)""")
+    conn.execute("""create table if not exists explorer(
+                    name text primary key,
+                    country text,
+                    description text)""")
+    for table in ("user", "xuser"):
+        conn.execute(f"""create table if not exists
+                    {table}(
+                      name text primary key,
+                      hashed_passwd text, salt bytes)""")
+
+def create_versioning(conn: Connection) -> None:
+    for table in ("creature", "explorer", "user"):
+        version.create_versioning(conn, table)
+
+def create_search(conn: Connection) -> None:
+    for table in search.INDEXED:
+        search.create_index(conn, table)
+
+def create_filter_indexes(conn: Connection) -> None:
+    # name is included so filtered pages come back in keyset order
+    # straight from the index, without a sort
+    conn.execute("create index if not exists creature_country on creature(country, name)")
+    conn.execute("create index if not exists creature_area on creature(area, name)")
+    conn.execute("create index if not exists explorer_country on explorer(country, name)")
+    conn.execute("analyze")
+
+MIGRATIONS = [
+    create_tables,
+    create_versioning,
+    create_search,
+    create_filter_indexes,
+]
+
+def get_version(conn: Connection) -> int:
+    return conn.execute("pragma user_version").fetchone()[0]
+
+def migrate(conn: Connection) -> int:
+    """Bring the schema up to date; return the new schema version"""
+    while get_version(conn) < len(MIGRATIONS):
+        # Take the write lock before reading the version again, so that
+        # workers starting together apply each step only once
+        conn.execute("begin immediate")
+        try:
+            current = get_version(conn)
+            if current < len(MIGRATIONS):
+                MIGRATIONS[current](conn)
+                conn.execute(f"pragma user_version = {current + 1}")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+    return len(MIGRATIONS)
@@ -0,0 +1,69 @@
+import os
+from typing import Iterator
+from .init import get_conn
+
+CHUNK_SIZE = int(os.getenv("CRYPTID_EXPORT_CHUNK_SIZE", "1000"))
+
+def page_query(table: str, columns: tuple[str, ...],
+               after: str | None = None, limit: int | None = None,
+               fields: list[str] | None = None,
+               filters: dict | None = None) -> tuple[str, dict]:
+    """Return the SQL and parameters get_page() runs"""
+    fields = list(fields or columns)
+    filters = {col: value for col, value in (filters or {}).items()
+               if value is not None}
+    for col in (*fields, *filters):
+        if col not in columns:
+            raise ValueError(f"Unknown {table} field {col}")
+
+    select = fields if "name" in fields else ["name", *fields]
+    where = [f"{col} = :{col}" for col in filters]
+    params = dict(filters)
+    if after is not None:
+        where.append("name > :after")
+        params["after"] = after
+
+    qry = f"select {', '.join(select)} from {table}"
+    if where:
+        qry += " where " + " and ".join(where)
+    qry += " order by name"
+    if limit:
+        qry += " limit :limit"
+        params["limit"] = limit + 1
+    return qry, params
+
+def get_page(table: str, columns: tuple[str, ...],
+             after: str | None = None, limit: int | None = None,
+             fields: list[str] | None = None,
+             filters: dict | None = None) -> tuple[list[dict], str | None]:
+    """Return up to <limit> rows of <table> ordered by name, starting
+    after the name <after>, with only <fields> in each row dict.
+    The second return value is the last name if more rows follow."""
+    qry, params = page_query(table, columns, after=after, limit=limit,
+                             fields=fields, filters=filters)
+    with get_conn(read_only=True) as conn:
+        rows = conn.execute(qry, params).fetchall()
+
+    last = None
+    if limit and len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1][0]
+
+    fields = list(fields or columns)
+    skip = 0 if "name" in fields else 1
+    return [dict(zip(fields, row[skip:])) for row in rows], last
+
+def iter_chunks(table: str, columns: tuple[str, ...],
+                chunk_size: int | None = None) -> Iterator[list[dict]]:
+    """Yield every row of <table> as lists of up to <chunk_size> dicts.
+    Each chunk is a keyset page read on a connection borrowed just for
+    it, so a slow client never keeps a pooled connection. Rows written
+    during the export show up if they sort after the current page."""
+    chunk_size = chunk_size or CHUNK_SIZE
+    after = None
+    while True:
+        rows, after = get_page(table, columns, after=after, limit=chunk_size)
+        if rows:
+            yield rows
+        if after is None:
+            return
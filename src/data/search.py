@@ -0,0 +1,84 @@
+"""Full-text search over creatures and explorers with SQLite FTS5.
+
+Each searchable table gets an external-content <table>_fts index that
+triggers keep in step with it. Rebuild the indexes of an existing
+database (or after a VACUUM, which may renumber rowids) with:
+
+    python -m data.search rebuild
+"""
+from sqlite3 import Connection, OperationalError
+from .init import get_conn
+from .errors import SearchException
+
+INDEXED = {
+    "creature": ("name", "description", "aka", "area"),
+    "explorer": ("name", "description"),
+}
+
+def create_index(conn: Connection, table: str) -> None:
+    """Create the FTS index and sync triggers for <table> if missing"""
+    cols = INDEXED[table]
+    fts = f"{table}_fts"
+    new = ", ".join(f"new.{col}" for col in cols)
+    old = ", ".join(f"old.{col}" for col in cols)
+    names = ", ".join(cols)
+    exists = conn.execute(
+        "select 1 from sqlite_master where type='table' and name=?",
+        (fts,)).fetchone()
+
+    conn.execute(f"""create virtual table if not exists {fts}
+                     using fts5({names}, content='{table}', content_rowid='rowid')""")
+    conn.execute(f"""create trigger if not exists {fts}_ai after insert on {table} begin
+                       insert into {fts}(rowid, {names}) values (new.rowid, {new});
+                     end""")
+    conn.execute(f"""create trigger if not exists {fts}_ad after delete on {table} begin
+                       insert into {fts}({fts}, rowid, {names}) values ('delete', old.rowid, {old});
+                     end""")
+    conn.execute(f"""create trigger if not exists {fts}_au after update on {table} begin
+                       insert into {fts}({fts}, rowid, {names}) values ('delete', old.rowid, {old});
+                       insert into {fts}(rowid, {names}) values (new.rowid, {new});
+                     end""")
+    if not exists:
+        conn.execute(f"insert into {fts}({fts}) values ('rebuild')")
+
+def to_match(q: str) -> str:
+    """Quote each word of <q> so FTS5 treats it as a term, not syntax"""
+    return " ".join('"' + word.replace('"', '""') + '"' for word in q.split())
+
+def search(table: str, columns: tuple[str, ...], q: str,
+           limit: int = 20, offset: int = 0) -> tuple[list[dict], bool]:
+    """Return up to <limit> rows of <table> matching every word of <q>,
+    best match first, and whether more rows follow. A <q> with no
+    words, only spaces say, matches nothing."""
+    fts = f"{table}_fts"
+    select = ", ".join(f"t.{col}" for col in columns)
+    qry = f"""select {select} from {fts} f
+              join {table} t on t.rowid = f.rowid
+              where {fts} match :q
+              order by bm25({fts})
+              limit :limit offset :offset"""
+    if not (match := to_match(q)):
+        return [], False
+    params = {"q": match, "limit": limit + 1, "offset": offset}
+    with get_conn(read_only=True) as conn:
+        try:
+            rows = conn.execute(qry, params).fetchall()
+        except OperationalError as exc:
+            if "fts5" not in str(exc):
+                raise
+            raise SearchException(msg=f"Invalid search {q!r}: {exc}")
+
+    return [dict(zip(columns, row)) for row in rows[:limit]], len(rows) > limit
+
+def rebuild(table: str | None = None) -> None:
+    """Rebuild the FTS index of <table>, or of every searchable table"""
+    with get_conn() as conn:
+        for name in ([table] if table else INDEXED):
+            conn.execute(f"insert into {name}_fts({name}_fts) values ('rebuild')")
+        conn.commit()
+
+if __name__ == "__main__":
+    import sys
+    if sys.argv[1:2] != ["rebuild"]:
+        sys.exit("usage: python -m data.search rebuild [creature|explorer]")
+    rebuild(*sys.argv[2:3])
@@ -1,16 +1,8 @@
 from model.user import User
-from .init import (conn, curs, IntegrityError)
+from .init import (get_conn, Connection, IntegrityError)
+from . import writer
 from .errors import MissingException, DuplicateException
 
-curs.execute("""create table if not exists
-                user(
-                  name text primary key,
-                  hashed_passwd text, salt bytes)""")
-curs.execute("""create table if not exists
-                xuser(
-                  name text primary key,
-                  hashed_passwd text, salt bytes)""")
-
 def row_to_model(row: tuple) -> User:
     name, hashed_passwd, salt = row
     return User(name=name, hashed_passwd=hashed_passwd, salt=salt)
@@ -21,24 +13,24 @@ def model_to_dict(user: User) -> dict | None:
 def get_user_salt(name: str) -> str:
     qry = "select salt from user where name=:name"
     params = {"name": name}
-    curs.execute(qry, params)
-    row = curs.fetchone()
+    with get_conn(read_only=True) as conn:
+        row = conn.execute(qry, params).fetchone()
 
     return row[0]
 
 def get_hash_for_user(name: str) -> str:
     qry = "select hashed_passwd from user where name=:name"
     params = {"name": name}
-    curs.execute(qry, params)
-    row = curs.fetchone()
+    with get_conn(read_only=True) as conn:
+        row = conn.execute(qry, params).fetchone()
 
     return row[0]
 
 def get_one(name: str) -> User:
     qry = "select * from user where name=:name"
     params = {"name": name}
-    curs.execute(qry, params)
-    row = curs.fetchone()
+    with get_conn(read_only=True) as conn:
+        row = conn.execute(qry, params).fetchone()
     if row:
         return row_to_model(row)
     else:
@@ -46,45 +38,57 @@ def get_one(name: str) -> User:
 
 def get_all() -> list[User]:
     qry = "select * from user"
-    curs.execute(qry)
-    return [row_to_model(row) for row in curs.fetchall()]
+    with get_conn(read_only=True) as conn:
+        rows = conn.execute(qry).fetchall()
+    return [row_to_model(row) for row in rows]
 
-def create(user: User, table:str = "user"):
+def _create(conn: Connection, user: User, table: str = "user") -> User:
     qry = f"""insert into {table}
         (name, hashed_passwd, salt)
         values
         (:name, :hashed_passwd, :salt)"""
     params = model_to_dict(user)
     try:
-        curs.execute(qry, params)
-        conn.commit()
-        return user
+        conn.execute(qry, params)
     except IntegrityError:
         raise DuplicateException(msg=
             f"{table}: user {user.name} already exists")
+    return user
+
+def create(user: User, table:str = "user"):
+    return writer.write(_create, user, table)
 
-def modify(name: str, passwd: str)  -> User:
+def _modify(conn: Connection, name: str, passwd: str,
+            salt: bytes | None = None) -> User:
     qry = """update user set
-             name=:name, hashed_passwd=:hashed_passwd
-             where name=:name0"""
+             name=:name, hashed_passwd=:hashed_passwd,
+             salt=coalesce(:salt, salt)
+             where name=:name0
+             returning *"""
     params = {
         "name": name,
         "hashed_passwd": passwd,
+        "salt": salt,
         "name0": name}
-    curs.execute(qry, params)
-    conn.commit()
-    if curs.rowcount == 1:
-        return get_one(name)
+    row = conn.execute(qry, params).fetchone()
+    if row:
+        return row_to_model(row)
     else:
         raise MissingException(msg=f"User {name} not found")
 
-def delete(name: str) -> None:
-    """Drop user with <name> from user table, add to xuser table"""
-    user = get_one(name)
-    qry = "delete from user where name = :name"
+def modify(name: str, passwd: str, salt: bytes | None = None)  -> User:
+    """Store the hashed <passwd> for user <name>, and its <salt> if given"""
+    return writer.write(_modify, name, passwd, salt)
+
+def _delete(conn: Connection, name: str) -> None:
+    qry = "delete from user where name = :name returning *"
     params = {"name": name}
-    curs.execute(qry, params)
-    conn.commit()
-    if curs.rowcount != 1:
+    row = conn.execute(qry, params).fetchone()
+    if not row:
         raise MissingException(msg=f"User {name} not found")
-    create(user, table="xuser")
\ No newline at end of file
+    conn.execute("""insert or replace into xuser (name, hashed_passwd, salt)
+                    values (?, ?, ?)""", row)
+
+def delete(name: str) -> None:
+    """Drop user with <name> from user table, add to xuser table"""
+    return writer.write(_delete, name)
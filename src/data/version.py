@@ -0,0 +1,30 @@
+"""Per-table version counters, bumped by triggers on every row change,
+so readers can tell whether anything changed without reading rows"""
+from sqlite3 import Connection
+from .init import get_conn
+
+def create_versioning(conn: Connection, table: str) -> None:
+    """Start counting changes to <table> if not already"""
+    conn.execute("""create table if not exists table_version(
+                      name text primary key,
+                      version integer not null default 0)""")
+    conn.execute("insert or ignore into table_version (name) values (?)",
+                 (table,))
+    for event in ("insert", "update", "delete"):
+        conn.execute(f"""create trigger if not exists {table}_version_{event}
+                         after {event} on {table} begin
+                           update table_version set version = version + 1
+                           where name = '{table}';
+                         end""")
+
+def get_version(table: str) -> int:
+    """Return the change counter of <table>"""
+    qry = "select version from table_version where name=:name"
+    with get_conn(read_only=True) as conn:
+        row = conn.execute(qry, {"name": table}).fetchone()
+    return row[0] if row else 0
+
+def get_versions() -> dict[str, int]:
+    """Return the change counter of every versioned table"""
+    with get_conn(read_only=True) as conn:
+        return dict(conn.execute("select name, version from table_version"))
@@ -0,0 +1,125 @@
+"""Run single-row writes through write(), optionally with group commit.
+
+By default write() applies an operation and commits it at once, as
+before. With CRYPTID_GROUP_COMMIT set, operations are queued for one
+writer thread instead, which applies up to GROUP_COMMIT_OPS of them,
+or whatever arrives within GROUP_COMMIT_MS, in a single transaction.
+Each runs in its own savepoint, so one that fails (say with
+DuplicateException) is undone alone, and its caller gets its own
+error. Callers return only after the shared commit.
+
+An operation is a function taking the writer connection first; it must
+not commit.
+"""
+import os
+from concurrent.futures import Future
+from queue import Empty, Queue
+from threading import Lock, Thread
+from time import monotonic
+from sqlite3 import Connection
+from telemetry.metrics import GROUP_COMMIT_BATCH
+from .init import get_conn
+
+GROUP_COMMIT = bool(os.getenv("CRYPTID_GROUP_COMMIT"))
+GROUP_COMMIT_MS = float(os.getenv("CRYPTID_GROUP_COMMIT_MS", "5"))
+GROUP_COMMIT_OPS = int(os.getenv("CRYPTID_GROUP_COMMIT_OPS", "256"))
+
+_queue: Queue = Queue()
+_thread: Thread | None = None
+_thread_lock = Lock()
+# Held to enqueue, so no operation can land behind _STOP
+_queue_lock = Lock()
+_stopping = False
+_STOP = object()
+
+def write(op, *args):
+    """Return <op>(conn, *args), once it has been committed.
+    Raises RuntimeError if stop() is under way."""
+    if not GROUP_COMMIT:
+        with get_conn() as conn:
+            result = op(conn, *args)
+            conn.commit()
+        return result
+    future = Future()
+    with _queue_lock:
+        if _stopping:
+            raise RuntimeError("The writer is stopping")
+        _queue.put((op, args, future))
+    start()
+    return future.result()
+
+def start() -> None:
+    """Start the writer thread if it is not running"""
+    global _thread
+    if _thread:
+        return
+    with _thread_lock:
+        if not _thread:
+            _thread = Thread(target=_run, name="cryptid-writer", daemon=True)
+            _thread.start()
+
+def stop() -> None:
+    """Apply what is queued, then stop the writer thread. Writes
+    made meanwhile are refused; later ones start it again."""
+    global _thread, _stopping
+    with _thread_lock:
+        if not _thread:
+            return
+        with _queue_lock:
+            _stopping = True
+            _queue.put(_STOP)
+        try:
+            _thread.join()
+        finally:
+            _thread = None
+            _stopping = False
+
+def _next_batch() -> tuple[list, bool]:
+    """Wait for an operation, then gather more until the batch is full
+    or GROUP_COMMIT_MS has passed. The flag is set to stop after it."""
+    batch = []
+    item = _queue.get()
+    deadline = monotonic() + GROUP_COMMIT_MS / 1000
+    while item is not _STOP:
+        batch.append(item)
+        if len(batch) >= GROUP_COMMIT_OPS:
+            break
+        try:
+            item = _queue.get(timeout=max(0, deadline - monotonic()))
+        except Empty:
+            break
+    return batch, item is _STOP
+
+def _apply(conn: Connection, batch: list) -> list:
+    """Run each operation of <batch> in a savepoint; return the result
+    or exception of each"""
+    outcomes = []
+    conn.execute("begin")
+    for op, args, _ in batch:
+        conn.execute("savepoint op")
+        try:
+            outcomes.append((op(conn, *args), None))
+        except Exception as exc:
+            conn.execute("rollback to op")
+            outcomes.append((None, exc))
+        conn.execute("release op")
+    conn.commit()
+    return outcomes
+
+def _run() -> None:
+    while True:
+        batch, stopping = _next_batch()
+        if batch:
+            GROUP_COMMIT_BATCH.observe(len(batch))
+            try:
+                with get_conn() as conn:
+                    outcomes = _apply(conn, batch)
+            except Exception as exc:
+                outcomes = [(None, exc)] * len(batch)
+            for (_, _, future), (result, exc) in zip(batch, outcomes):
+                if exc:
+                    future.set_exception(exc)
+                else:
+                    future.set_result(result)
+        if stopping:
+            return
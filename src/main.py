@@ -1,32 +1,88 @@
-from fastapi import FastAPI, Request
+import os
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from web import explorer, creature, user
 
-app = FastAPI()
+from web import metrics, profiles, user
+from web.compression import CompressionMiddleware
+from telemetry import profiler
+from telemetry.middleware import MetricsMiddleware, ProfilerMiddleware
 
-app.include_router(user.router)
-app.include_router(explorer.router)
-app.include_router(creature.router)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the database (and migrate its schema) once at startup,
+    rather than as a side effect of importing the data modules"""
+    from data import init
+    init.get_db()
+    if os.getenv("CRYPTID_ASYNC_DB"):
+        from data.aio import init as aio_init
+        aio_init.get_db()
+    from service import invalidation
+    invalidation.check(force=True)
+    yield
+    from data import writer
+    writer.stop()
+    if os.getenv("CRYPTID_ASYNC_DB"):
+        await aio_init.close_db()
+    init.close_db()
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost"],
-    allow_credentials=True,
-    allow_headers=["*"],
-    allow_methods=["*"]
-)
+def create_app() -> FastAPI:
+    """Build the application; uvicorn can call this with factory=True"""
+    from web import explorer, creature
+    # CRYPTID_ASYNC_DB only swaps the single-item routes for ones on
+    # aiosqlite; listing, search, export and bulk are the same either way
+    if os.getenv("CRYPTID_ASYNC_DB"):
+        from web.aio import explorer as explorer_items, creature as creature_items
+    else:
+        explorer_items, creature_items = explorer, creature
 
-@app.get('/')
-def top():
-    return "top here"
+    app = FastAPI(lifespan=lifespan)
 
-@app.get("/echo/{thing}")
-def echo(thing):
-    return f"echoing {thing}"
+    app.include_router(user.router)
+    app.include_router(user.token_router)
+    app.include_router(explorer.collection_router)
+    app.include_router(explorer_items.router)
+    app.include_router(creature.collection_router)
+    app.include_router(creature_items.router)
+    app.include_router(metrics.router)
+    app.include_router(profiles.router)
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["http://localhost"],
+        allow_credentials=True,
+        allow_headers=["*"],
+        allow_methods=["*"]
+    )
+    app.add_middleware(CompressionMiddleware)
+    app.add_middleware(MetricsMiddleware)
+    if profiler.ENABLED:
+        app.add_middleware(ProfilerMiddleware)
+
+    @app.get('/')
+    def top():
+        return "top here"
+
+    @app.get("/echo/{thing}")
+    def echo(thing):
+        return f"echoing {thing}"
+
+    return app
+
+app = create_app()
 
 if __name__ == "__main__":
+    import sys
     import uvicorn
+    # Each worker is a separate process with its own caches; see
+    # service/invalidation.py for how they stay coherent
+    workers = int(os.getenv("CRYPTID_WORKERS", "1"))
+    # Reloading is for development only (python main.py --reload, or
+    # CRYPTID_RELOAD=1); uvicorn ignores workers when it is on
+    reload = "--reload" in sys.argv[1:] or bool(os.getenv("CRYPTID_RELOAD"))
     uvicorn.run(
-        "main:app",
-        reload=True
-    )
\ No newline at end of file
+        "main:create_app",
+        factory=True,
+        workers=workers,
+        reload=reload
+    )
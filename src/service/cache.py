@@ -0,0 +1,81 @@
+"""Small thread-safe LRU cache with per-entry expiry"""
+import os
+from collections import OrderedDict
+from threading import Lock
+from time import time
+
+CACHE_SIZE = int(os.getenv("CRYPTID_CACHE_SIZE", "1024"))
+CACHE_TTL = float(os.getenv("CRYPTID_CACHE_TTL", "0")) or None
+
+_MISSING = object()
+
+class TTLCache:
+    """Keep at most <maxsize> entries, dropping the least recently used.
+
+    Entries expire <ttl> seconds after they are set, or at the
+    absolute time passed to set() as <expires_at>.
+
+    <generation> goes up on every pop() and clear(). A reader filling
+    the cache from the database notes it before reading and passes it
+    to set(), which then skips the value if a write invalidated the
+    cache in between, so the stale row is not put back.
+    """
+    def __init__(self, maxsize: int = 1024, ttl: float | None = None) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.generation = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value, expires_at: float | None = None,
+            generation: int | None = None) -> None:
+        if self.maxsize <= 0:
+            return
+        if expires_at is None and self.ttl:
+            expires_at = time() + self.ttl
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+            self.generation += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.generation += 1
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
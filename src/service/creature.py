@@ -1,20 +1,92 @@
+from typing import Iterator
 from model.creature import Creature
 import data.creature as data
+from . import invalidation
+from .cache import TTLCache, CACHE_SIZE, CACHE_TTL
+
+creature_cache = TTLCache(maxsize=CACHE_SIZE, ttl=CACHE_TTL)
+invalidation.register("creature", creature_cache)
 
 def get_all() -> list[Creature]:
     return data.get_all()
 
+def get_page(after: str | None = None, limit: int | None = None,
+             fields: list[str] | None = None,
+             country: str | None = None,
+             area: str | None = None) -> tuple[list[dict], str | None]:
+    return data.get_page(after=after, limit=limit, fields=fields,
+        country=country, area=area)
+
+def iter_chunks() -> Iterator[list[dict]]:
+    return data.iter_chunks()
+
+def search_text(q: str, limit: int = 20, offset: int = 0) -> tuple[list[dict], bool]:
+    return data.search_text(q, limit=limit, offset=offset)
+
+def get_version() -> int:
+    return invalidation.version("creature")
+
 def get_one(name: str) -> Creature | None:
-    return data.get_one(name)
+    invalidation.check()
+    if (creature := creature_cache.get(name)):
+        return creature
+    generation = creature_cache.generation
+    creature = data.get_one(name)
+    if creature:
+        creature_cache.set(name, creature, generation=generation)
+    return creature
+
+def get_many(names: list[str]) -> tuple[list[Creature], list[str]]:
+    """Return the creatures named in <names>, in that order, and the names
+    not found. Only names missing from the cache go to the database."""
+    invalidation.check()
+    names = list(dict.fromkeys(names))
+    found = {}
+    for name in names:
+        if (creature := creature_cache.get(name)):
+            found[name] = creature
+    if (wanted := [name for name in names if name not in found]):
+        generation = creature_cache.generation
+        for creature in data.get_many(wanted):
+            creature_cache.set(creature.name, creature, generation=generation)
+            found[creature.name] = creature
+    return ([found[name] for name in names if name in found],
+            [name for name in names if name not in found])
 
 def create(creature: Creature) -> Creature:
-    return data.create(creature)
+    try:
+        return data.create(creature)
+    finally:
+        evict(creature.name)
+
+def create_many(creatures: list[Creature], upsert: bool = False) -> list[str]:
+    try:
+        return data.create_many(creatures, upsert=upsert)
+    finally:
+        for creature in creatures:
+            creature_cache.pop(creature.name)
+        invalidation.expire()
 
 # def replace(name, creature: Creature) -> Creature:
 #     return data.replace(name, creature)
 
 def modify(creature: Creature) -> Creature:
-    return data.modify(creature)
+    try:
+        return data.modify(creature)
+    finally:
+        evict(creature.name)
+
+def delete(name: str) -> bool:
+    try:
+        return data.delete(name)
+    finally:
+        evict(name)
+
+def evict(name: str) -> None:
+    """Forget what is cached for <name>, after a write to it, including
+    one made without this module (as through data.aio)"""
+    creature_cache.pop(name)
+    invalidation.expire()
 
-def delete(creature: Creature) -> bool:
-    return data.delete(creature)
\ No newline at end of file
+def cache_stats() -> dict:
+    return creature_cache.stats()
@@ -1,20 +1,91 @@
+from typing import Iterator
 from model.explorer import Explorer
 import data.explorer as data
+from . import invalidation
+from .cache import TTLCache, CACHE_SIZE, CACHE_TTL
+
+explorer_cache = TTLCache(maxsize=CACHE_SIZE, ttl=CACHE_TTL)
+invalidation.register("explorer", explorer_cache)
 
 def get_all() -> list[Explorer]:
     return data.get_all()
 
+def get_page(after: str | None = None, limit: int | None = None,
+             fields: list[str] | None = None,
+             country: str | None = None) -> tuple[list[dict], str | None]:
+    return data.get_page(after=after, limit=limit, fields=fields,
+        country=country)
+
+def iter_chunks() -> Iterator[list[dict]]:
+    return data.iter_chunks()
+
+def search_text(q: str, limit: int = 20, offset: int = 0) -> tuple[list[dict], bool]:
+    return data.search_text(q, limit=limit, offset=offset)
+
+def get_version() -> int:
+    return invalidation.version("explorer")
+
 def get_one(name: str) -> Explorer | None:
-    return data.get_one(name)
+    invalidation.check()
+    if (explorer := explorer_cache.get(name)):
+        return explorer
+    generation = explorer_cache.generation
+    explorer = data.get_one(name)
+    if explorer:
+        explorer_cache.set(name, explorer, generation=generation)
+    return explorer
+
+def get_many(names: list[str]) -> tuple[list[Explorer], list[str]]:
+    """Return the explorers named in <names>, in that order, and the names
+    not found. Only names missing from the cache go to the database."""
+    invalidation.check()
+    names = list(dict.fromkeys(names))
+    found = {}
+    for name in names:
+        if (explorer := explorer_cache.get(name)):
+            found[name] = explorer
+    if (wanted := [name for name in names if name not in found]):
+        generation = explorer_cache.generation
+        for explorer in data.get_many(wanted):
+            explorer_cache.set(explorer.name, explorer, generation=generation)
+            found[explorer.name] = explorer
+    return ([found[name] for name in names if name in found],
+            [name for name in names if name not in found])
 
 def create(explorer: Explorer) -> Explorer:
-    return data.create(explorer)
+    try:
+        return data.create(explorer)
+    finally:
+        evict(explorer.name)
+
+def create_many(explorers: list[Explorer], upsert: bool = False) -> list[str]:
+    try:
+        return data.create_many(explorers, upsert=upsert)
+    finally:
+        for explorer in explorers:
+            explorer_cache.pop(explorer.name)
+        invalidation.expire()
 
 # def replace(id, explorer: Explorer) -> Explorer:
 #     return data.replace(id, explorer)
 
 def modify(explorer: Explorer) -> Explorer:
-    return data.modify(explorer)
+    try:
+        return data.modify(explorer)
+    finally:
+        evict(explorer.name)
+
+def delete(name: str) -> bool:
+    try:
+        return data.delete(name)
+    finally:
+        evict(name)
+
+def evict(name: str) -> None:
+    """Forget what is cached for <name>, after a write to it, including
+    one made without this module (as through data.aio)"""
+    explorer_cache.pop(name)
+    invalidation.expire()
 
-def delete(explorer: Explorer) -> bool:
-    return data.delete(explorer)
\ No newline at end of file
+def cache_stats() -> dict:
+    return explorer_cache.stats()
@@ -0,0 +1,86 @@
+"""Run password hashing off the event loop, in a bounded worker pool"""
+import asyncio
+import hashlib
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from threading import Lock
+from telemetry.metrics import LOGIN_REJECTED, PASSWORD_HASH_LATENCY
+
+# "thread" is usually enough, since hashlib releases the GIL while hashing
+HASH_EXECUTOR = os.getenv("CRYPTID_HASH_EXECUTOR", "thread")
+HASH_WORKERS = int(os.getenv("CRYPTID_HASH_WORKERS", str(os.cpu_count() or 1)))
+HASH_MAX_IN_FLIGHT = int(os.getenv("CRYPTID_HASH_MAX_IN_FLIGHT", str(HASH_WORKERS * 4)))
+
+_executor: Executor | None = None
+_executor_lock = Lock()
+_slots = asyncio.Semaphore(HASH_MAX_IN_FLIGHT)
+_counts_lock = Lock()
+_waiting = 0
+_in_flight = 0
+
+def pbkdf2(plain: str, salt: bytes, iterations: int) -> str:
+    """Return the hex PBKDF2-SHA256 hash of <plain>"""
+    return hashlib.pbkdf2_hmac(
+        password=plain.encode(encoding="utf-8"),
+        hash_name='sha256',
+        salt=salt,
+        iterations=iterations).hex()
+
+def get_executor() -> Executor:
+    global _executor
+    with _executor_lock:
+        if not _executor:
+            if HASH_EXECUTOR == "process":
+                _executor = ProcessPoolExecutor(max_workers=HASH_WORKERS)
+            else:
+                _executor = ThreadPoolExecutor(
+                    max_workers=HASH_WORKERS,
+                    thread_name_prefix="cryptid-hash")
+    return _executor
+
+def _count(waiting: int = 0, in_flight: int = 0) -> None:
+    global _waiting, _in_flight
+    with _counts_lock:
+        _waiting += waiting
+        _in_flight += in_flight
+
+def run_sync(fn, *args):
+    """Run <fn>(*args) in the hash pool and wait for the result"""
+    _count(in_flight=1)
+    try:
+        with PASSWORD_HASH_LATENCY.time():
+            return get_executor().submit(fn, *args).result()
+    finally:
+        _count(in_flight=-1)
+
+class HashPoolBusy(Exception):
+    def __init__(self, msg: str) -> None:
+        self.msg = msg
+
+async def run(fn, *args, fail_fast: bool = False):
+    """Await <fn>(*args) in the hash pool, at most HASH_MAX_IN_FLIGHT at once.
+    With <fail_fast>, raise HashPoolBusy instead of waiting for a slot."""
+    if fail_fast and _slots.locked():
+        LOGIN_REJECTED.inc(reason="busy")
+        raise HashPoolBusy(msg="Too many password checks in progress")
+    _count(waiting=1)
+    async with _slots:
+        _count(waiting=-1, in_flight=1)
+        try:
+            loop = asyncio.get_running_loop()
+            with PASSWORD_HASH_LATENCY.time():
+                return await loop.run_in_executor(get_executor(), fn, *args)
+        finally:
+            _count(in_flight=-1)
+
+def stats() -> dict:
+    """Return current hash pool occupancy"""
+    with _counts_lock:
+        waiting, in_flight = _waiting, _in_flight
+    return {
+        "workers": HASH_WORKERS,
+        "max_in_flight": HASH_MAX_IN_FLIGHT,
+        "waiting": waiting,
+        "in_flight": in_flight,
+        "queue_depth": waiting + max(0, in_flight - HASH_WORKERS),
+    }
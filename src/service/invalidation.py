@@ -0,0 +1,57 @@
+"""Keep in-process caches coherent across worker processes.
+
+Each worker has its own caches, and nothing but the SQLite file is
+shared, so a worker cannot be told when another one writes. Instead
+check() compares the table_version counters (bumped by triggers on
+every row change) with the ones it saw last, at most once every
+POLL_MS, and clears every cache registered for a table that changed.
+The counters it saw also serve as table versions for ETags, so reads
+need not query them each time.
+"""
+import os
+from threading import Lock
+from time import monotonic
+from data.version import get_version, get_versions
+from .cache import TTLCache
+
+POLL_MS = float(os.getenv("CRYPTID_INVALIDATION_POLL_MS", "100"))
+
+_caches: dict[str, list[TTLCache]] = {}
+_seen: dict[str, int] = {}
+_next_poll = 0.0
+_lock = Lock()
+
+def register(table: str, cache: TTLCache) -> None:
+    """Clear <cache> whenever <table> is changed by any process"""
+    _caches.setdefault(table, []).append(cache)
+
+def check(force: bool = False) -> None:
+    """Clear the caches of tables changed since the last poll"""
+    global _next_poll
+    if not force and monotonic() < _next_poll:
+        return
+    # Only one thread polls; the others keep using the caches meanwhile
+    if not _lock.acquire(blocking=False):
+        return
+    try:
+        _next_poll = monotonic() + POLL_MS / 1000
+        for table, version in get_versions().items():
+            if _seen.get(table, version) != version:
+                for cache in _caches.get(table, ()):
+                    cache.clear()
+            _seen[table] = version
+    finally:
+        _lock.release()
+
+def expire() -> None:
+    """Poll on the next check(), after a write from this process"""
+    global _next_poll
+    _next_poll = 0.0
+
+def version(table: str) -> int:
+    """Return the change counter of <table> as of the last poll, which
+    is at most POLL_MS old, or since a write from this process"""
+    check()
+    if (seen := _seen.get(table)) is not None:
+        return seen
+    return get_version(table)
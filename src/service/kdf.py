@@ -0,0 +1,130 @@
+"""Password key derivation, with the algorithm and cost stored in the hash.
+
+Stored hashes look like
+
+    pbkdf2_sha256$i=600000$<hex digest>
+    scrypt$n=16384,r=8,p=1$<hex digest>
+
+so the cost can be raised, or the algorithm changed, without breaking
+existing users: each hash is checked with the parameters it was made
+with, and needs_rehash() tells when to replace it after a good login.
+Hashes from before this format are bare hex PBKDF2-SHA256 digests of
+LEGACY_ITERATIONS rounds.
+
+Pick parameters for this host with
+
+    python -m service.kdf calibrate [pbkdf2_sha256|scrypt] [target_ms]
+"""
+import hashlib
+import hmac
+import os
+from time import perf_counter
+
+LEGACY_ITERATIONS = 600000
+
+KDF = os.getenv("CRYPTID_KDF", "pbkdf2_sha256")
+PBKDF2_ITERATIONS = int(os.getenv("CRYPTID_PBKDF2_ITERATIONS", str(LEGACY_ITERATIONS)))
+SCRYPT_N = int(os.getenv("CRYPTID_SCRYPT_N", "16384"))
+SCRYPT_R = int(os.getenv("CRYPTID_SCRYPT_R", "8"))
+SCRYPT_P = int(os.getenv("CRYPTID_SCRYPT_P", "1"))
+
+ALGORITHMS = ("pbkdf2_sha256", "scrypt")
+
+def current_params(algorithm: str | None = None) -> dict:
+    """Return the configured cost parameters for new <algorithm> hashes"""
+    algorithm = algorithm or KDF
+    if algorithm == "pbkdf2_sha256":
+        return {"i": PBKDF2_ITERATIONS}
+    if algorithm == "scrypt":
+        return {"n": SCRYPT_N, "r": SCRYPT_R, "p": SCRYPT_P}
+    raise ValueError(f"Unknown KDF {algorithm}")
+
+def derive(plain: str, salt: bytes, algorithm: str, params: dict) -> str:
+    """Return the hex digest of <plain> under <algorithm> and <params>"""
+    password = plain.encode(encoding="utf-8")
+    if algorithm == "pbkdf2_sha256":
+        return hashlib.pbkdf2_hmac("sha256", password, salt, params["i"]).hex()
+    if algorithm == "scrypt":
+        n, r, p = params["n"], params["r"], params["p"]
+        return hashlib.scrypt(password, salt=salt, n=n, r=r, p=p,
+                              maxmem=256 * n * r * p + (1 << 20)).hex()
+    raise ValueError(f"Unknown KDF {algorithm}")
+
+def encode(algorithm: str, params: dict, digest: str) -> str:
+    settings = ",".join(f"{key}={value}" for key, value in params.items())
+    return f"{algorithm}${settings}${digest}"
+
+def parse(stored: str) -> tuple[str, dict, str]:
+    """Split a stored hash into its algorithm, parameters and digest.
+    Raises ValueError if it is malformed."""
+    if "$" not in stored:
+        return "pbkdf2_sha256", {"i": LEGACY_ITERATIONS}, stored
+    algorithm, settings, digest = stored.split("$")
+    params = {}
+    for setting in settings.split(","):
+        key, value = setting.split("=")
+        params[key] = int(value)
+    return algorithm, params, digest
+
+def hash_password(plain: str, salt: bytes, algorithm: str | None = None,
+                  params: dict | None = None) -> str:
+    """Return the stored form of <plain>, by default with the
+    configured KDF and cost"""
+    algorithm = algorithm or KDF
+    params = params or current_params(algorithm)
+    return encode(algorithm, params, derive(plain, salt, algorithm, params))
+
+def verify(plain: str, salt: bytes, stored: str) -> bool:
+    """Check <plain> against <stored>, using the parameters in <stored>.
+    A malformed <stored> hash matches nothing."""
+    try:
+        algorithm, params, digest = parse(stored)
+        derived = derive(plain, salt, algorithm, params)
+    except (ValueError, KeyError):
+        return False
+    return hmac.compare_digest(derived.encode(), digest.encode())
+
+def needs_rehash(stored: str) -> bool:
+    """Whether <stored> was made with other than the configured KDF and cost"""
+    algorithm, params, _ = parse(stored)
+    return algorithm != KDF or params != current_params()
+
+def time_hash(algorithm: str, params: dict) -> float:
+    """Return the seconds one hash takes with <params>"""
+    start = perf_counter()
+    derive("calibration", os.urandom(16), algorithm, params)
+    return perf_counter() - start
+
+def calibrate(algorithm: str, target_ms: float = 250) -> dict:
+    """Return the cheapest <algorithm> parameters that take at least
+    <target_ms> per hash on this host. PBKDF2 iterations scale
+    linearly; scrypt doubles n (and so its memory use) each step."""
+    target = target_ms / 1000
+    if algorithm == "pbkdf2_sha256":
+        probe = 100000
+        elapsed = min(time_hash(algorithm, {"i": probe}) for _ in range(3))
+        return {"i": max(1000, int(round(probe * target / elapsed, -3)))}
+    if algorithm == "scrypt":
+        params = {"n": 1024, "r": SCRYPT_R, "p": SCRYPT_P}
+        while time_hash(algorithm, params) < target:
+            params["n"] *= 2
+        return params
+    raise ValueError(f"Unknown KDF {algorithm}")
+
+if __name__ == "__main__":
+    import sys
+    args = sys.argv[1:]
+    if args[:1] != ["calibrate"] or (args[1:2] and args[1] not in ALGORITHMS):
+        sys.exit("usage: python -m service.kdf calibrate "
+                 "[pbkdf2_sha256|scrypt] [target_ms]")
+    algorithm = args[1] if len(args) > 1 else KDF
+    target_ms = float(args[2]) if len(args) > 2 else 250
+    params = calibrate(algorithm, target_ms)
+    elapsed = time_hash(algorithm, params) * 1000
+    print(f"# {algorithm} at {elapsed:.0f} ms per hash")
+    print(f"CRYPTID_KDF={algorithm}")
+    if algorithm == "pbkdf2_sha256":
+        print(f"CRYPTID_PBKDF2_ITERATIONS={params['i']}")
+    else:
+        for key in ("n", "r", "p"):
+            print(f"CRYPTID_SCRYPT_{key.upper()}={params[key]}")
@@ -0,0 +1,69 @@
+"""In-memory token buckets to limit login attempts.
+
+Every /token attempt costs a full password hash, so attempts are
+limited per username and per client address. Buckets are kept for the
+RATE_LIMIT_SIZE most recently seen keys; an evicted key starts again
+with a full bucket.
+"""
+import os
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from telemetry.metrics import LOGIN_REJECTED
+
+USER_RATE = float(os.getenv("CRYPTID_LOGIN_USER_RATE", "0.2"))
+USER_BURST = float(os.getenv("CRYPTID_LOGIN_USER_BURST", "5"))
+IP_RATE = float(os.getenv("CRYPTID_LOGIN_IP_RATE", "1"))
+IP_BURST = float(os.getenv("CRYPTID_LOGIN_IP_BURST", "20"))
+RATE_LIMIT_SIZE = int(os.getenv("CRYPTID_RATE_LIMIT_SIZE", "10000"))
+
+class RateLimited(Exception):
+    def __init__(self, msg: str, retry_after: float) -> None:
+        self.msg = msg
+        self.retry_after = retry_after
+
+class TokenBucket:
+    """Allow <rate> events per second per key, in bursts of up to <burst>"""
+    def __init__(self, rate: float, burst: float,
+                 maxsize: int = RATE_LIMIT_SIZE) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.maxsize = maxsize
+        self._buckets: OrderedDict = OrderedDict()
+        self._lock = Lock()
+
+    def take(self, key) -> float:
+        """Spend a token for <key>. Return 0 if there was one, or else
+        the seconds until there will be."""
+        now = monotonic()
+        with self._lock:
+            tokens, last = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / self.rate
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+user_limiter = TokenBucket(USER_RATE, USER_BURST)
+ip_limiter = TokenBucket(IP_RATE, IP_BURST)
+
+def check_login(name: str, client: str | None = None) -> None:
+    """Spend a login attempt for user <name> from address <client>,
+    or raise RateLimited if either has none left"""
+    if client and (wait := ip_limiter.take(client)):
+        LOGIN_REJECTED.inc(reason="ip")
+        raise RateLimited(msg="Too many login attempts from this address",
+                          retry_after=wait)
+    if (wait := user_limiter.take(name)):
+        LOGIN_REJECTED.inc(reason="user")
+        raise RateLimited(msg=f"Too many login attempts for user {name}",
+                          retry_after=wait)
@@ -0,0 +1,117 @@
+"""Access tokens signed with a rotating keyring.
+
+CRYPTID_TOKEN_KEYS lists the signing keys as kid:secret pairs,
+separated by commas; CRYPTID_TOKEN_ACTIVE_KID names the one that signs
+new tokens (by default the first). Keep a retired key in the list until
+the tokens it signed have expired.
+
+CRYPTID_TOKEN_BACKEND picks the format of new tokens:
+
+- "jose": an HS256 JWT with the kid in its header
+- "compact": c1.<kid>.<base64 subject>.<exp>.<base64 HMAC-SHA256>, which
+  needs no JSON or generic JWT handling to check
+
+Tokens of either format are accepted whatever the backend, so switching
+does not log anyone out.
+"""
+import hashlib
+import hmac
+import os
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as DecodeError
+from time import time
+from jose import jwt
+from jose.exceptions import JWTError
+
+# The only key when CRYPTID_TOKEN_KEYS is unset, which also checks
+# tokens without a kid, from before the keyring.
+# Set CRYPTID_TOKEN_KEYS for production!
+LEGACY_KID = "default"
+LEGACY_KEY = "keep-it-secret-keep-it-safe"
+ALGORITHM = "HS256"
+COMPACT_PREFIX = "c1"
+
+def parse_keys(spec: str) -> dict[str, str]:
+    """Return the kid: secret pairs in a CRYPTID_TOKEN_KEYS <spec>"""
+    keys = {}
+    for pair in spec.split(","):
+        if pair.strip():
+            kid, secret = pair.strip().split(":", 1)
+            keys[kid] = secret
+    return keys
+
+KEYS = parse_keys(os.getenv("CRYPTID_TOKEN_KEYS", "")) or {LEGACY_KID: LEGACY_KEY}
+ACTIVE_KID = os.getenv("CRYPTID_TOKEN_ACTIVE_KID") or next(iter(KEYS))
+BACKEND = os.getenv("CRYPTID_TOKEN_BACKEND", "jose")
+
+def _b64encode(raw: bytes) -> str:
+    return urlsafe_b64encode(raw).decode().rstrip("=")
+
+def _b64decode(text: str) -> bytes:
+    return urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+def _sign(key: str, payload: str) -> str:
+    return _b64encode(hmac.new(key.encode(), payload.encode(), hashlib.sha256).digest())
+
+def encode_jose(sub: str, exp: int, kid: str) -> str:
+    return jwt.encode({"sub": sub, "exp": exp}, KEYS[kid], algorithm=ALGORITHM,
+                      headers={"kid": kid})
+
+def decode_jose(token: str) -> tuple[str, int] | None:
+    try:
+        kid = jwt.get_unverified_header(token).get("kid", LEGACY_KID)
+        if not (key := KEYS.get(kid)):
+            return None
+        payload = jwt.decode(token, key, algorithms=[ALGORITHM])
+    except JWTError:
+        return None
+    if not (sub := payload.get("sub")):
+        return None
+    return sub, payload.get("exp")
+
+def encode_compact(sub: str, exp: int, kid: str) -> str:
+    payload = f"{COMPACT_PREFIX}.{kid}.{_b64encode(sub.encode())}.{exp}"
+    return f"{payload}.{_sign(KEYS[kid], payload)}"
+
+def decode_compact(token: str) -> tuple[str, int] | None:
+    payload, _, sig = token.rpartition(".")
+    parts = payload.split(".")
+    if len(parts) != 4 or not (key := KEYS.get(parts[1])):
+        return None
+    # Compare bytes: compare_digest() refuses non-ASCII str
+    if not hmac.compare_digest(_sign(key, payload).encode(),
+                               sig.encode("utf-8", "surrogateescape")):
+        return None
+    try:
+        sub, exp = _b64decode(parts[2]).decode(), int(parts[3])
+    except (DecodeError, UnicodeDecodeError, ValueError):
+        return None
+    if exp <= time() or not sub:
+        return None
+    return sub, exp
+
+BACKENDS = {
+    "jose": encode_jose,
+    "compact": encode_compact,
+}
+
+def encode(sub: str, exp: int, backend: str | None = None) -> str:
+    """Return a token for subject <sub> that expires at the Unix time
+    <exp>, signed with the active key"""
+    return BACKENDS[backend or BACKEND](sub, exp, ACTIVE_KID)
+
+def key_id(token: str) -> str | None:
+    """Return the kid <token> claims to be signed with, without checking it"""
+    if token.startswith(COMPACT_PREFIX + "."):
+        parts = token.split(".")
+        return parts[1] if len(parts) == 5 else None
+    try:
+        return jwt.get_unverified_header(token).get("kid", LEGACY_KID)
+    except JWTError:
+        return None
+
+def decode(token: str) -> tuple[str, int] | None:
+    """Return the subject and expiry of a valid <token>, or None"""
+    if token.startswith(COMPACT_PREFIX + "."):
+        return decode_compact(token)
+    return decode_jose(token)
@@ -1,9 +1,9 @@
-from datetime import timedelta, datetime
+from datetime import timedelta
 import os
-from jose import jwt
-from jose.exceptions import JWTError
+from time import time
+from fastapi.concurrency import run_in_threadpool
 from model.user import User
-from copy import deepcopy
+from data.errors import MissingException
 
 
 from os import urandom
@@ -16,43 +16,70 @@ else:
 # --- New auth stuff
 
 import hashlib
+from telemetry.metrics import AUTH_READS_SAVED
+from . import hashing, invalidation, kdf, ratelimit, tokens
+from .cache import TTLCache
 
-# Change SECRET_KEY for production!
-SECRET_KEY = "keep-it-secret-keep-it-safe"
-ALGORITHM = "HS256"
-N_ITER = 600000
+TOKEN_CACHE_SIZE = int(os.getenv("CRYPTID_TOKEN_CACHE_SIZE", "4096"))
+USER_CACHE_SIZE = int(os.getenv("CRYPTID_USER_CACHE_SIZE", "1024"))
+USER_CACHE_TTL = float(os.getenv("CRYPTID_USER_CACHE_TTL", "300"))
+
+# Verified tokens, by digest, until they expire: (username, kid)
+token_cache = TTLCache(maxsize=TOKEN_CACHE_SIZE)
+# Users by name, for the auth path; cleared when any worker changes users
+user_cache = TTLCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL)
+invalidation.register("user", user_cache)
 
 def verify_password(user: User, plain: str) -> bool:
     """Hash <plain> and compare with <hash> from the database"""
-    hash_ = hashlib.pbkdf2_hmac(
-        password=plain.encode(encoding="utf-8"),
-        hash_name='sha256',
-        salt=user.salt,
-        iterations=N_ITER).hex()
+    return hashing.run_sync(kdf.verify, plain, user.salt, user.hashed_passwd)
 
-    return  hash_ == user.hashed_passwd
+async def verify_password_async(user: User, plain: str) -> bool:
+    """Like verify_password(), without blocking the event loop.
+    Raises HashPoolBusy rather than queue behind too many others."""
+    return await hashing.run(kdf.verify, plain, user.salt, user.hashed_passwd,
+                             fail_fast=True)
 
 def get_hash(plain: str):
     """Return the hash of a <plain> string"""
     salt = urandom(16)
     return (
-        hashlib.pbkdf2_hmac(
-        password=plain.encode(encoding="utf-8"),
-        hash_name='sha256',
-        salt=salt,
-        iterations=N_ITER).hex(),
+        hashing.run_sync(kdf.hash_password, plain, salt),
         salt
     )
 
+def rehash(user: User, plain: str) -> User:
+    """Store <plain> again with the configured KDF and cost, if the
+    hash of <user> was made with others"""
+    if not kdf.needs_rehash(user.hashed_passwd):
+        return user
+    hashed_passwd, salt = get_hash(plain)
+    return modify_hash(user.name, hashed_passwd, salt)
+
+async def rehash_async(user: User, plain: str) -> User:
+    """Like rehash(), without blocking the event loop"""
+    if not kdf.needs_rehash(user.hashed_passwd):
+        return user
+    salt = urandom(16)
+    hashed_passwd = await hashing.run(kdf.hash_password, plain, salt)
+    return await run_in_threadpool(modify_hash, user.name, hashed_passwd, salt)
+
 def get_jwt_username(token:str) -> str | None:
     """Return username from JWT access <token>"""
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        if not (username := payload.get("sub")):
-            return None
-    except JWTError:
+    key = hashlib.sha256(token.encode()).digest()
+    if (cached := token_cache.get(key)):
+        username, kid = cached
+        # A token stops working once its key is dropped from the keyring
+        if kid in tokens.KEYS:
+            return username
+        token_cache.pop(key)
+        return None
+    if not (claims := tokens.decode(token)):
         return None
 
+    username, exp = claims
+    if exp:
+        token_cache.set(key, (username, tokens.key_id(token)), expires_at=exp)
     return username
 
 def get_current_user(token: str) -> User | None:
@@ -65,9 +92,18 @@ def get_current_user(token: str) -> User | None:
 
 def lookup_user(username: str) -> User | None:
     """Return a matching User from the database for <name>"""
-    if (user := data.get_one(username)):
+    invalidation.check()
+    if (user := user_cache.get(username)):
+        AUTH_READS_SAVED.inc()
         return user
-    return None
+    generation = user_cache.generation
+    try:
+        user = data.get_one(username)
+    except MissingException:
+        return None
+    if user:
+        user_cache.set(username, user, generation=generation)
+    return user
 
 def auth_user(name: str, plain: str) -> User | None:
     """Authenticate user <name> and <plain> password"""
@@ -76,19 +112,27 @@ def auth_user(name: str, plain: str) -> User | None:
         return None
     if not verify_password(user, plain):
         return None
-    return user
+    return rehash(user, plain)
+
+async def auth_user_async(name: str, plain: str,
+                          client: str | None = None) -> User | None:
+    """Authenticate user <name> and <plain> password from async code,
+    raising RateLimited if <name> or <client> tried too often"""
+    ratelimit.check_login(name, client)
+    user = await run_in_threadpool(lookup_user, name)
+    if not user:
+        return None
+    if not await verify_password_async(user, plain):
+        return None
+    return await rehash_async(user, plain)
 
 def create_access_token(data: dict,
     expires: timedelta | None = None
 ):
-    """Return a JWT access token"""
-    src = deepcopy(data)
-    now = datetime.utcnow()
+    """Return an access token for the "sub" in <data>"""
     if not expires:
         expires = timedelta(minutes=15)
-    src.update({"exp": now + expires})
-    encoded_jwt = jwt.encode(src, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+    return tokens.encode(data["sub"], int(time() + expires.total_seconds()))
 
 # --- CRUD passthrough stuff
 
@@ -109,7 +153,20 @@ def create(name: str, passwd: str) -> User:
     return data.create(user)
 
 def modify(name: str, passwd: str) -> User:
-    return data.modify(name, passwd)
+    try:
+        return data.modify(name, passwd)
+    finally:
+        user_cache.pop(name)
+
+def modify_hash(name: str, hashed_passwd: str, salt: bytes) -> User:
+    try:
+        return data.modify(name, hashed_passwd, salt=salt)
+    finally:
+        user_cache.pop(name)
 
 def delete(name: str) -> None:
-    return data.delete(name)
\ No newline at end of file
+    """Delete user <name>, which moves it to the xuser table"""
+    try:
+        return data.delete(name)
+    finally:
+        user_cache.pop(name)
\ No newline at end of file
@@ -0,0 +1,169 @@
+"""In-process metrics, rendered in the Prometheus text exposition format"""
+from bisect import bisect_left
+from contextlib import contextmanager
+from threading import Lock
+from time import perf_counter
+from typing import Iterator
+
+REGISTRY: list["Metric"] = []
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _labels(names: tuple[str, ...], values: tuple) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"'
+                     for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, doc: str, labels: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.doc = doc
+        self.labels = labels
+        self._lock = Lock()
+        self._values: dict[tuple, float] = {}
+        REGISTRY.append(self)
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(labels[name] for name in self.labels)
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_labels(self.labels, key)} {value}"
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def set_total(self, value: float, **labels) -> None:
+        """Copy in <value> from a count kept elsewhere, which must only
+        ever go up"""
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+DEFAULT_BUCKETS = (.005, .01, .025, .05, .075, .1, .25, .5, .75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, doc: str, labels: tuple[str, ...] = (),
+                 buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        super().__init__(name, doc, labels)
+        self.buckets = tuple(sorted(buckets))
+        # per label set: [count per bucket..., count above, sum]
+        self._values: dict[tuple, list[float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            if not (counts := self._values.get(key)):
+                counts = self._values[key] = [0] * (len(self.buckets) + 2)
+            counts[index] += 1
+            counts[-1] += value
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(perf_counter() - start, **labels)
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            items = [(key, list(counts)) for key, counts in self._values.items()]
+        names = (*self.labels, "le")
+        for key, counts in items:
+            total = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                total += count
+                yield f"{self.name}_bucket{_labels(names, (*key, bound))} {total}"
+            yield f"{self.name}_sum{_labels(self.labels, key)} {counts[-1]}"
+            yield f"{self.name}_count{_labels(self.labels, key)} {total}"
+
+def render() -> str:
+    """Return every registered metric in text exposition format"""
+    return "\n".join(metric.render() for metric in REGISTRY) + "\n"
+
+# --- Metrics shared across layers
+
+HTTP_REQUESTS = Counter(
+    "cryptid_http_requests_total",
+    "HTTP requests by route template and status",
+    ("method", "route", "status"))
+HTTP_LATENCY = Histogram(
+    "cryptid_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ("method", "route"))
+HTTP_IN_FLIGHT = Gauge(
+    "cryptid_http_requests_in_flight",
+    "HTTP requests being handled")
+DB_QUERY_LATENCY = Histogram(
+    "cryptid_db_execute_duration_seconds",
+    "Time in SQLite execute() by statement type, not including fetching rows",
+    ("statement",),
+    buckets=(.0001, .00025, .0005, .001, .0025, .005, .01, .025, .05, .1, .5, 1.0))
+PASSWORD_HASH_LATENCY = Histogram(
+    "cryptid_password_hash_duration_seconds",
+    "Time to hash a password, including time queued for a worker",
+    buckets=(.05, .1, .25, .5, .75, 1.0, 2.5, 5.0, 10.0))
+THREADPOOL_BUSY = Gauge(
+    "cryptid_threadpool_busy_threads",
+    "Threadpool workers running sync endpoints")
+THREADPOOL_SIZE = Gauge(
+    "cryptid_threadpool_max_threads",
+    "Threadpool worker limit for sync endpoints")
+HASH_POOL = Gauge(
+    "cryptid_hash_pool",
+    "Password hash pool occupancy",
+    ("state",))
+CACHE_EVENTS = Counter(
+    "cryptid_cache_events_total",
+    "Cache hits, misses and evictions since startup",
+    ("cache", "event"))
+CACHE_SIZE = Gauge(
+    "cryptid_cache_entries",
+    "Entries held in each cache",
+    ("cache",))
+AUTH_READS_SAVED = Counter(
+    "cryptid_auth_db_reads_saved_total",
+    "User lookups on the auth path answered from the user cache")
+LOGIN_REJECTED = Counter(
+    "cryptid_login_rejected_total",
+    "Login attempts refused before hashing, by reason",
+    ("reason",))
+GROUP_COMMIT_BATCH = Histogram(
+    "cryptid_group_commit_ops",
+    "Writes applied per group commit transaction",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512))
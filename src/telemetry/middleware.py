@@ -0,0 +1,78 @@
+from functools import partial
+from random import random
+from time import perf_counter, time
+from anyio import to_thread
+from . import profiler
+from .metrics import HTTP_IN_FLIGHT, HTTP_LATENCY, HTTP_REQUESTS
+
+class MetricsMiddleware:
+    """Record latency, status and in-flight counts for every HTTP request,
+    labelled by route template (/creature/{name}) rather than raw path"""
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_status(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        start = perf_counter()
+        try:
+            await self.app(scope, receive, send_status)
+        finally:
+            elapsed = perf_counter() - start
+            HTTP_IN_FLIGHT.dec()
+            # The router leaves the matched route in scope
+            route = getattr(scope.get("route"), "path", "unmatched")
+            method = scope["method"]
+            HTTP_LATENCY.observe(elapsed, method=method, route=route)
+            HTTP_REQUESTS.inc(method=method, route=route, status=status)
+
+# Profiling these would only push real profiles out of the ring buffer
+SKIP_PATHS = ("/admin/profiles", "/metrics")
+
+class ProfilerMiddleware:
+    """Profile a random <rate> of HTTP requests, keeping those slower
+    than <slow_ms> in the profiler's ring buffer"""
+    def __init__(self, app, rate: float = profiler.SAMPLE_RATE,
+                 slow_ms: float = profiler.SLOW_MS) -> None:
+        self.app = app
+        self.rate = rate
+        self.slow_ms = slow_ms
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or random() >= self.rate \
+                or scope["path"].startswith(SKIP_PATHS):
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_status(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        profile = profiler.start()
+        try:
+            await self.app(scope, receive, send_status)
+        finally:
+            duration_ms = profiler.stop(profile)
+            if duration_ms >= self.slow_ms:
+                await to_thread.run_sync(partial(
+                    profiler.save, profile, duration_ms,
+                    method=scope["method"],
+                    path=scope["path"],
+                    route=getattr(scope.get("route"), "path", "unmatched"),
+                    status=status,
+                    started=time() - duration_ms / 1000))
@@ -0,0 +1,217 @@
+"""Opt-in stack-sampling profiler for slow requests.
+
+While a sampled request is in flight, a background thread snapshots the
+stack of every busy thread each CRYPTID_PROFILE_INTERVAL_MS. That
+covers both the event loop and the threadpool worker running a sync
+endpoint, but also any other request being handled at the same time.
+Profiles of requests that took at least CRYPTID_PROFILE_SLOW_MS are kept
+in a ring buffer of CRYPTID_PROFILE_KEEP files under
+CRYPTID_PROFILE_DIR, and can be exported for pstats or speedscope.
+"""
+import json
+import marshal
+import os
+import sys
+import tempfile
+from contextvars import ContextVar
+from pathlib import Path
+from threading import Event, Lock, Thread
+from time import perf_counter, time_ns
+from types import FrameType
+
+ENABLED = bool(os.getenv("CRYPTID_PROFILE"))
+SAMPLE_RATE = float(os.getenv("CRYPTID_PROFILE_SAMPLE_RATE", "0.01"))
+SLOW_MS = float(os.getenv("CRYPTID_PROFILE_SLOW_MS", "0"))
+INTERVAL_MS = float(os.getenv("CRYPTID_PROFILE_INTERVAL_MS", "5"))
+PROFILE_DIR = Path(os.getenv("CRYPTID_PROFILE_DIR",
+                             Path(tempfile.gettempdir()) / "cryptid-profiles"))
+KEEP = int(os.getenv("CRYPTID_PROFILE_KEEP", "50"))
+MAX_DEPTH = 128
+MAX_STATEMENTS = 1000
+
+# Innermost frames of threads that are waiting, not working
+IDLE = {
+    ("threading.py", "wait"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+}
+
+_statements: ContextVar[list[str] | None] = ContextVar("statements", default=None)
+
+def record_sql(sql: str) -> None:
+    """Note a statement run on behalf of the request being profiled"""
+    if (statements := _statements.get()) is not None \
+            and len(statements) < MAX_STATEMENTS:
+        statements.append(" ".join(sql.split()))
+
+Frame = tuple[str, str, int]
+
+def _stack(frame: FrameType) -> tuple[Frame, ...]:
+    stack = []
+    while frame and len(stack) < MAX_DEPTH:
+        code = frame.f_code
+        stack.append((code.co_qualname, code.co_filename, code.co_firstlineno))
+        frame = frame.f_back
+    return tuple(reversed(stack))
+
+def _idle(stack: tuple[Frame, ...]) -> bool:
+    name, file, _ = stack[-1]
+    return (os.path.basename(file), name) in IDLE
+
+class Profile:
+    def __init__(self) -> None:
+        self.counts: dict[tuple[Frame, ...], int] = {}
+        self.statements: list[str] = []
+        self.start = perf_counter()
+
+    def add(self, stack: tuple[Frame, ...]) -> None:
+        self.counts[stack] = self.counts.get(stack, 0) + 1
+
+class Sampler:
+    """Sample thread stacks for as long as any profile is active"""
+    def __init__(self, interval_ms: float = INTERVAL_MS) -> None:
+        self.interval = interval_ms / 1000
+        self._active: list[Profile] = []
+        self._lock = Lock()
+        self._thread: Thread | None = None
+        self._wake = Event()
+
+    def start(self) -> Profile:
+        profile = Profile()
+        with self._lock:
+            self._active.append(profile)
+            if not self._thread:
+                self._thread = Thread(target=self._run, daemon=True,
+                                      name="cryptid-profiler")
+                self._thread.start()
+        return profile
+
+    def stop(self, profile: Profile) -> None:
+        with self._lock:
+            self._active.remove(profile)
+
+    def _run(self) -> None:
+        me = self._thread.ident
+        while True:
+            self._wake.wait(self.interval)
+            stacks = [_stack(frame)
+                      for ident, frame in sys._current_frames().items()
+                      if ident != me]
+            stacks = [stack for stack in stacks if stack and not _idle(stack)]
+            with self._lock:
+                if not self._active:
+                    self._thread = None
+                    return
+                for profile in self._active:
+                    for stack in stacks:
+                        profile.add(stack)
+
+sampler = Sampler()
+
+def start() -> Profile:
+    """Begin sampling for the current request"""
+    profile = sampler.start()
+    _statements.set(profile.statements)
+    return profile
+
+def stop(profile: Profile) -> float:
+    """Stop sampling for <profile>; return its duration in ms"""
+    sampler.stop(profile)
+    _statements.set(None)
+    return (perf_counter() - profile.start) * 1000
+
+# --- Ring buffer on disk
+
+def save(profile: Profile, duration_ms: float, **meta) -> str:
+    """Write <profile> to the ring buffer, dropping the oldest beyond KEEP"""
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    profile_id = str(time_ns())
+    frames: dict[Frame, int] = {}
+    stacks = [[[frames.setdefault(frame, len(frames)) for frame in stack], count]
+              for stack, count in profile.counts.items()]
+    doc = {
+        "id": profile_id,
+        "duration_ms": round(duration_ms, 3),
+        "interval_ms": INTERVAL_MS,
+        **meta,
+        "statements": profile.statements,
+        "frames": list(frames),
+        "stacks": stacks,
+    }
+    path = PROFILE_DIR / f"{profile_id}.json"
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(doc))
+    tmp.replace(path)
+
+    for old in sorted(PROFILE_DIR.glob("*.json"))[:-KEEP or None]:
+        old.unlink(missing_ok=True)
+    return profile_id
+
+def list_profiles() -> list[dict]:
+    """Return the metadata of every stored profile, newest first"""
+    profiles = []
+    for path in sorted(PROFILE_DIR.glob("*.json"), reverse=True):
+        try:
+            doc = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+        for key in ("frames", "stacks", "statements"):
+            doc.pop(key, None)
+        profiles.append(doc)
+    return profiles
+
+def load(profile_id: str) -> dict | None:
+    if not profile_id.isdigit():
+        return None
+    try:
+        return json.loads((PROFILE_DIR / f"{profile_id}.json").read_text())
+    except (OSError, ValueError):
+        return None
+
+def to_speedscope(doc: dict) -> dict:
+    """Convert a stored profile to the speedscope file format"""
+    interval = doc["interval_ms"]
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "name": f"{doc.get('method')} {doc.get('path')}",
+        "exporter": "cryptid",
+        "shared": {"frames": [{"name": name, "file": file, "line": line}
+                              for name, file, line in doc["frames"]]},
+        "profiles": [{
+            "type": "sampled",
+            "name": f"{doc.get('method')} {doc.get('route')}",
+            "unit": "milliseconds",
+            "startValue": 0,
+            "endValue": sum(count for _, count in doc["stacks"]) * interval,
+            "samples": [stack for stack, _ in doc["stacks"]],
+            "weights": [count * interval for _, count in doc["stacks"]],
+        }],
+    }
+
+def to_pstats(doc: dict) -> bytes:
+    """Convert a stored profile to a file pstats.Stats() can load.
+    Call counts are sample counts, not real calls."""
+    interval = doc["interval_ms"] / 1000
+    keys = [(file, line, name) for name, file, line in doc["frames"]]
+    stats: dict[tuple, list] = {}
+
+    def entry(key):
+        return stats.setdefault(key, [0, 0, 0.0, 0.0, {}])
+
+    for stack, count in doc["stacks"]:
+        seconds = count * interval
+        funcs = [keys[index] for index in stack]
+        entry(funcs[-1])[2] += seconds
+        for func in set(funcs):
+            item = entry(func)
+            item[0] += count
+            item[1] += count
+            item[3] += seconds
+        for caller, callee in set(zip(funcs, funcs[1:])):
+            cc, nc, tt, ct = entry(callee)[4].get(caller, (0, 0, 0.0, 0.0))
+            own = seconds if callee == funcs[-1] else 0.0
+            entry(callee)[4][caller] = (cc + count, nc + count, tt + own, ct + seconds)
+
+    return marshal.dumps({key: (cc, nc, tt, ct, callers)
+                          for key, (cc, nc, tt, ct, callers) in stats.items()})
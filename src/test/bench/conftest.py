@@ -0,0 +1,26 @@
+"""Benchmarks, run with pytest-benchmark.
+
+They are skipped unless CRYPTID_BENCH is set. Save a JSON baseline,
+then compare later runs against it:
+
+    CRYPTID_BENCH=1 pytest test/bench --benchmark-save=baseline
+    CRYPTID_BENCH=1 pytest test/bench --benchmark-compare \
+        --benchmark-compare-fail=mean:10%
+
+Set CRYPTID_BENCH_LARGE=1 as well for the million-row cases.
+"""
+import os
+import pytest
+
+os.environ.setdefault("CRYPTID_SQLITE_DB", ":memory:")
+
+def pytest_collection_modifyitems(config, items):
+    if os.getenv("CRYPTID_BENCH"):
+        return
+    skip = pytest.mark.skip(reason="set CRYPTID_BENCH=1 to run benchmarks")
+    for item in items:
+        if "test/bench" in str(item.fspath).replace(os.sep, "/"):
+            item.add_marker(skip)
+
+large = pytest.mark.skipif(not os.getenv("CRYPTID_BENCH_LARGE"),
+                           reason="set CRYPTID_BENCH_LARGE=1 for 1M-row cases")
@@ -0,0 +1,27 @@
+"""Password login and JWT validation in service.user"""
+import pytest
+from service import user as service
+
+NAME = "bench-login"
+PASSWD = "correct horse battery staple"
+
+@pytest.fixture(scope="module")
+def login_user():
+    try:
+        service.delete(NAME)
+    except Exception:
+        pass
+    return service.create(NAME, PASSWD)
+
+def test_auth_user(benchmark, login_user):
+    resp = benchmark.pedantic(service.auth_user, args=(NAME, PASSWD), rounds=5)
+    assert resp.name == NAME
+
+@pytest.mark.parametrize("cached", [False, True], ids=["cold", "cached"])
+def test_get_jwt_username(benchmark, cached):
+    token = service.create_access_token(data={"sub": NAME})
+    def validate():
+        if not cached:
+            service.token_cache.clear()
+        return service.get_jwt_username(token)
+    assert benchmark(validate) == NAME
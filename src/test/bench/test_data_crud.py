@@ -0,0 +1,69 @@
+"""Single-row CRUD and get_all() in the data layer"""
+from itertools import count
+import pytest
+from model import Creature, Explorer, User
+from data import creature, explorer, user
+from data.init import get_conn
+from .conftest import large
+
+names = count()
+
+def new_creature() -> Creature:
+    return Creature(name=f"crud-{next(names)}", description="Benchmark beast",
+                    country="XX", area="Lab", aka="")
+
+def new_explorer() -> Explorer:
+    return Explorer(name=f"crud-{next(names)}", country="XX",
+                    description="Benchmark explorer")
+
+def new_user() -> User:
+    return User(name=f"crud-{next(names)}", hashed_passwd="x" * 64,
+                salt=b"0123456789abcdef")
+
+@pytest.mark.parametrize("module, new", [
+    (creature, new_creature),
+    (explorer, new_explorer),
+    (user, new_user),
+], ids=["creature", "explorer", "user"])
+class TestCrud:
+    def test_create(self, benchmark, module, new):
+        benchmark(lambda: module.create(new()))
+
+    def test_get_one(self, benchmark, module, new):
+        obj = module.create(new())
+        benchmark(module.get_one, obj.name)
+
+    def test_modify(self, benchmark, module, new):
+        obj = module.create(new())
+        if module is user:
+            benchmark(module.modify, obj.name, obj.hashed_passwd)
+        else:
+            benchmark(module.modify, obj)
+
+    def test_delete(self, benchmark, module, new):
+        def setup():
+            return (module.create(new()).name,), {}
+        benchmark.pedantic(module.delete, setup=setup, rounds=200)
+
+@pytest.fixture(params=[
+    1_000,
+    100_000,
+    pytest.param(1_000_000, marks=large),
+], ids=["1k", "100k", "1M"])
+def creature_rows(request):
+    """Fill the creature table with <param> rows for the test"""
+    with get_conn() as conn:
+        conn.execute("delete from creature")
+        conn.commit()
+    creature.create_many([
+        Creature(name=f"row-{i:07}", description="Benchmark beast",
+                 country="XX", area="Lab", aka="")
+        for i in range(request.param)])
+    yield request.param
+    with get_conn() as conn:
+        conn.execute("delete from creature")
+        conn.commit()
+
+def test_get_all(benchmark, creature_rows):
+    rows = benchmark.pedantic(creature.get_all, rounds=3)
+    assert len(rows) == creature_rows
@@ -0,0 +1,56 @@
+"""Write throughput of data.creature create/modify.
+
+The "reread" cases add the get_one() round trip the write paths used to
+make after each commit, for comparison with RETURNING.
+
+test_concurrent_create uses a database file, since group commit is
+about saving the sync on each commit."""
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+import pytest
+from model.creature import Creature
+from data import creature, init, writer
+
+names = count()
+
+def sample() -> Creature:
+    return Creature(
+        name=f"bench-{next(names)}",
+        description="Benchmark beast",
+        country="XX",
+        area="Lab",
+        aka="")
+
+@pytest.mark.parametrize("reread", [False, True], ids=["returning", "reread"])
+def test_create(benchmark, reread):
+    def create():
+        resp = creature.create(sample())
+        if reread:
+            creature.get_one(resp.name)
+    benchmark(create)
+
+@pytest.mark.parametrize("reread", [False, True], ids=["returning", "reread"])
+def test_modify(benchmark, reread):
+    obj = creature.create(sample())
+    def modify():
+        resp = creature.modify(obj)
+        if reread:
+            creature.get_one(resp.name)
+    benchmark(modify)
+
+@pytest.fixture
+def file_db(tmp_path, monkeypatch):
+    monkeypatch.setenv("CRYPTID_SQLITE_DB", str(tmp_path / "bench.sqlite"))
+    init.get_db(reset=True)
+    yield
+    writer.stop()
+    monkeypatch.undo()
+    init.get_db(reset=True)
+
+@pytest.mark.parametrize("group_commit", [False, True], ids=["per_write", "group"])
+def test_concurrent_create(benchmark, file_db, monkeypatch, group_commit):
+    monkeypatch.setattr(writer, "GROUP_COMMIT", group_commit)
+    with ThreadPoolExecutor(32) as pool:
+        def burst():
+            list(pool.map(lambda _: creature.create(sample()), range(256)))
+        benchmark.pedantic(burst, rounds=5)
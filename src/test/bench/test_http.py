@@ -0,0 +1,68 @@
+"""End-to-end HTTP requests through main.app, in process"""
+import asyncio
+import httpx
+import pytest
+from model import Creature
+from service import creature, hashing, ratelimit
+from service import user as user_service
+from main import app
+
+NAME = "http-bench"
+PASSWD = "correct horse battery staple"
+
+@pytest.fixture(scope="module")
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+@pytest.fixture(scope="module")
+def client(loop):
+    try:
+        creature.create(Creature(name=NAME, description="Benchmark beast",
+                                 country="XX", area="Lab", aka=""))
+    except Exception:
+        pass
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app),
+                               base_url="http://bench")
+    yield client
+    loop.run_until_complete(client.aclose())
+
+@pytest.mark.parametrize("path", [f"/creature/{NAME}", "/creature?limit=50"],
+                         ids=["get_one", "get_page"])
+@pytest.mark.parametrize("concurrency", [1, 10, 50])
+def test_get(benchmark, loop, client, path, concurrency):
+    async def batch():
+        return await asyncio.gather(
+            *[client.get(path) for _ in range(concurrency)])
+    resps = benchmark(lambda: loop.run_until_complete(batch()))
+    assert all(resp.status_code == 200 for resp in resps)
+
+@pytest.fixture(scope="module")
+def login_user():
+    try:
+        user_service.delete(NAME)
+    except Exception:
+        pass
+    return user_service.create(NAME, PASSWD)
+
+@pytest.fixture
+def no_rate_limit(monkeypatch):
+    # Measure hashing, not 429s from repeated logins
+    unlimited = ratelimit.TokenBucket(rate=1e9, burst=1e9)
+    monkeypatch.setattr(ratelimit, "user_limiter", unlimited)
+    monkeypatch.setattr(ratelimit, "ip_limiter", unlimited)
+
+@pytest.mark.parametrize("concurrency", ["1", "max_in_flight"])
+def test_login(benchmark, loop, client, login_user, no_rate_limit, concurrency):
+    """POST /user/token: form parsing, rate limits, hash pool admission
+    and auth_user_async, as a client sees them. More concurrent logins
+    than HASH_MAX_IN_FLIGHT would be refused with 429 by design."""
+    count = 1 if concurrency == "1" else hashing.HASH_MAX_IN_FLIGHT
+    form = {"username": NAME, "password": PASSWD}
+    async def batch():
+        return await asyncio.gather(
+            *[client.post("/user/token", data=form) for _ in range(count)])
+    resps = benchmark.pedantic(lambda: loop.run_until_complete(batch()),
+                               rounds=5)
+    assert all(resp.status_code == 200 for resp in resps)
@@ -0,0 +1,17 @@
+"""Cost of one password hash with each KDF at its configured parameters.
+Use `python -m service.kdf calibrate` to pick parameters for a target
+latency, then set them in the environment and rerun to check."""
+import os
+import pytest
+from service import kdf
+
+@pytest.mark.parametrize("algorithm", kdf.ALGORITHMS)
+def test_hash(benchmark, algorithm):
+    salt = os.urandom(16)
+    params = kdf.current_params(algorithm)
+    benchmark.pedantic(kdf.derive, args=("secret", salt, algorithm, params),
+                       rounds=5)
+
+def test_calibrate():
+    params = kdf.calibrate("pbkdf2_sha256", target_ms=50)
+    assert kdf.time_hash("pbkdf2_sha256", params) > 0.025
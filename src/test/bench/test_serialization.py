@@ -0,0 +1,40 @@
+"""Building and serializing list responses: validated Pydantic models
+encoded by FastAPI (the old read path) against unvalidated rows encoded
+with orjson"""
+import pytest
+from pydantic import TypeAdapter
+from model.creature import Creature
+from data import creature
+from data.init import get_conn
+from web.encoding import ORJSONResponse
+
+ROWS = 10_000
+adapter = TypeAdapter(list[Creature])
+
+@pytest.fixture(scope="module")
+def rows():
+    with get_conn() as conn:
+        conn.execute("delete from creature")
+        conn.commit()
+    creature.create_many([
+        Creature(name=f"row-{i:07}", description="Benchmark beast",
+                 country="XX", area="Lab", aka="")
+        for i in range(ROWS)])
+    with get_conn(read_only=True) as conn:
+        yield conn.execute("select * from creature").fetchall()
+    with get_conn() as conn:
+        conn.execute("delete from creature")
+        conn.commit()
+
+def test_validated_models(benchmark, rows):
+    def build():
+        models = [Creature(name=row[0], description=row[1], country=row[2],
+                           area=row[3], aka=row[4]) for row in rows]
+        return adapter.dump_json(adapter.validate_python(models))
+    benchmark(build)
+
+def test_dict_rows_orjson(benchmark, rows):
+    def build():
+        page, _ = creature.get_page()
+        return ORJSONResponse(page).body
+    benchmark(build)
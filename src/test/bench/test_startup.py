@@ -0,0 +1,17 @@
+"""Cold start: importing main in a fresh interpreter, and building the
+app in process. Neither should touch the database any more."""
+import subprocess
+import sys
+from pathlib import Path
+from main import create_app
+
+SRC_DIR = Path(__file__).resolve().parent.parent.parent
+
+def test_import_main(benchmark):
+    def start():
+        subprocess.run([sys.executable, "-c", "import main"],
+                       cwd=SRC_DIR, check=True)
+    benchmark.pedantic(start, rounds=5)
+
+def test_create_app(benchmark):
+    benchmark(create_app)
@@ -0,0 +1,14 @@
+"""Encode and verify throughput of each access token backend"""
+from time import time
+import pytest
+from service import tokens
+
+@pytest.mark.parametrize("backend", tokens.BACKENDS)
+def test_encode(benchmark, backend):
+    exp = int(time()) + 600
+    benchmark(tokens.encode, "bench-login", exp, backend=backend)
+
+@pytest.mark.parametrize("backend", tokens.BACKENDS)
+def test_decode(benchmark, backend):
+    token = tokens.encode("bench-login", int(time()) + 600, backend=backend)
+    assert benchmark(tokens.decode, token)[0] == "bench-login"
@@ -0,0 +1,93 @@
+import asyncio
+import os
+import pytest
+from model.creature import Creature
+
+os.environ["CRYPTID_SQLITE_DB"] = ":memory:"
+
+from data.errors import MissingException, DuplicateException
+from data.aio import init
+from data.aio.creature import create, get_one, get_all, modify, delete
+
+@pytest.fixture
+def sample() -> Creature:
+    return Creature(
+        name="mothman",
+        description="Red-eyed winged humanoid",
+        country="US",
+        area="Point Pleasant",
+        aka="Birdman"
+    )
+
+def run(coro):
+    async def main():
+        try:
+            return await coro
+        finally:
+            await init.close_db()
+    init.get_db(reset=True)
+    return asyncio.run(main())
+
+def test_create(sample):
+    resp = run(create(sample))
+
+    assert resp == sample
+
+def test_create_duplicate(sample):
+    with pytest.raises(DuplicateException) as ex:
+        _ = run(create(sample))
+
+    assert f"Creature {sample.name} already exists" in str(ex.value.msg)
+
+def test_get_one(sample):
+    resp = run(get_one(sample.name))
+
+    assert resp == sample
+
+def test_get_all(sample):
+    resp = run(get_all())
+
+    assert sample in resp
+
+def test_get_one_missing():
+    with pytest.raises(MissingException) as ex:
+        _ = run(get_one(name="Pepita"))
+
+    assert ex.value.msg == "Creature Pepita not found"
+
+def test_modify(sample):
+    sample.area = "West Virginia"
+    resp = run(modify(creature=sample))
+
+    assert resp == sample
+
+def test_delete(sample):
+    resp = run(delete(sample.name))
+
+    assert resp == True
+
+def test_delete_missing(sample):
+    with pytest.raises(MissingException) as ex:
+        _ = run(delete(sample.name))
+
+    assert ex.value.msg == f"Creature {sample.name} not found"
+
+def test_reopen_after_close(sample):
+    async def main():
+        await create(sample)
+        await init.close_db()
+        # Reopened with fresh connections, not the closed ones
+        resp = await get_one(sample.name)
+        await delete(sample.name)
+        return resp
+    assert run(main()) == sample
+
+def test_reuse_across_loops(sample):
+    init.get_db(reset=True)
+    for _ in range(2):
+        async def main():
+            try:
+                return await get_all()
+            finally:
+                await init.close_db()
+        assert asyncio.run(main()) == []
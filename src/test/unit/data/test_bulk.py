@@ -0,0 +1,36 @@
+import os
+from model.explorer import Explorer
+
+os.environ["CRYPTID_SQLITE_DB"] = ":memory:"
+
+from data import bulk, explorer
+
+samples = [
+    Explorer(name="Ivan Sanderson", country="US", description="Naturalist"),
+    Explorer(name="Bernard Heuvelmans", country="BE", description="Zoologist"),
+]
+
+def test_create_many():
+    resp = explorer.create_many(samples + samples[:1])
+
+    assert resp == ["created", "created", "duplicate"]
+    assert explorer.get_one(samples[1].name) == samples[1]
+
+def test_create_many_upsert():
+    changed = samples[0].model_copy(update={"country": "GB"})
+    resp = explorer.create_many([changed], upsert=True)
+
+    assert resp == ["updated"]
+    assert explorer.get_one(changed.name) == changed
+
+def test_get_many(monkeypatch):
+    # One name per IN query, to go through the chunking
+    monkeypatch.setattr(bulk, "MAX_VARIABLES", 1)
+    names = [sample.name for sample in samples]
+    resp = explorer.get_many(names + ["Nobody"])
+
+    assert sorted(obj.name for obj in resp) == sorted(names)
+
+def test_cleanup():
+    for sample in samples:
+        assert explorer.delete(sample.name)
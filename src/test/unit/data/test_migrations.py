@@ -0,0 +1,34 @@
+import os
+import pytest
+
+os.environ["CRYPTID_SQLITE_DB"] = ":memory:"
+
+from data import creature, explorer
+from data.init import explain, get_conn
+from data.migrations import MIGRATIONS, get_version, migrate
+from data.paging import page_query
+
+def test_up_to_date():
+    with get_conn() as conn:
+        assert get_version(conn) == len(MIGRATIONS)
+        assert migrate(conn) == len(MIGRATIONS)
+
+@pytest.mark.parametrize("table, columns, filters, index", [
+    ("creature", creature.COLUMNS, {"country": "CN"}, "creature_country"),
+    ("creature", creature.COLUMNS, {"area": "Himalayas"}, "creature_area"),
+    ("explorer", explorer.COLUMNS, {"country": "FR"}, "explorer_country"),
+])
+def test_filtered_page_uses_index(table, columns, filters, index):
+    qry, params = page_query(table, columns, after="m", limit=10,
+                             filters=filters)
+    plan = " ".join(explain(qry, params))
+
+    assert f"INDEX {index}" in plan
+    assert "TEMP B-TREE" not in plan
+
+def test_page_uses_primary_key():
+    qry, params = page_query("creature", creature.COLUMNS, after="m", limit=10)
+    plan = " ".join(explain(qry, params))
+
+    assert "sqlite_autoindex_creature_1" in plan
+    assert "TEMP B-TREE" not in plan
@@ -0,0 +1,52 @@
+import os
+import pytest
+from model.creature import Creature
+
+os.environ["CRYPTID_SQLITE_DB"] = ":memory:"
+
+from data import creature
+
+@pytest.fixture(scope="module", autouse=True)
+def samples():
+    names = ["nessie", "morag", "champ", "ogopogo"]
+    for name in names:
+        creature.create(Creature(
+            name=name,
+            description="Lake monster",
+            country="XX",
+            area="lake" if name != "champ" else "Lake Champlain",
+            aka=""))
+    yield
+    for name in names:
+        creature.delete(name)
+
+def test_first_page():
+    rows, last = creature.get_page(limit=2, country="XX")
+
+    assert [row["name"] for row in rows] == ["champ", "morag"]
+    assert last == "morag"
+
+def test_next_page():
+    rows, last = creature.get_page(after="morag", limit=2, country="XX")
+
+    assert [row["name"] for row in rows] == ["nessie", "ogopogo"]
+    assert last is None
+
+def test_filter_and_fields():
+    rows, _ = creature.get_page(fields=["area"], country="XX", area="lake")
+
+    assert rows == [{"area": "lake"}] * 3
+
+def test_unknown_field():
+    with pytest.raises(ValueError):
+        creature.get_page(fields=["name; drop table creature"])
+
+def test_iter_chunks_returns_connection():
+    from data import init, paging
+    chunks = paging.iter_chunks("creature", creature.COLUMNS, chunk_size=3)
+    first = next(chunks)
+
+    # Paused between chunks, the export holds no reader
+    assert init.pool._readers.qsize() == init.POOL_SIZE
+    rest = [row for chunk in chunks for row in chunk]
+    assert [row["name"] for row in first + rest] == ["champ", "morag", "nessie", "ogopogo"]
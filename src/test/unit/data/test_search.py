@@ -0,0 +1,73 @@
+import os
+import pytest
+from model.creature import Creature
+
+os.environ["CRYPTID_SQLITE_DB"] = ":memory:"
+
+from data import creature, search
+from data.errors import SearchException
+from data.init import get_conn
+
+samples = [
+    Creature(name="Mokele-mbembe", country="CG", area="Congo basin",
+             description="Sauropod said to live in the swamps", aka=""),
+    Creature(name="Mapinguari", country="BR", area="Amazon",
+             description="Giant sloth of the swamps and swamps", aka="Mapinguary"),
+]
+
+def names(q: str) -> list[str]:
+    return [row["name"] for row in creature.search_text(q)[0]]
+
+def test_index_exists():
+    with get_conn(read_only=True) as conn:
+        tables = {row[0] for row in conn.execute(
+            "select name from sqlite_master where name like '%_fts'")}
+
+    assert {"creature_fts", "explorer_fts"} <= tables
+
+def test_insert_is_indexed():
+    for sample in samples:
+        creature.create(sample)
+
+    assert names("sauropod") == ["Mokele-mbembe"]
+    assert names("mapinguary") == ["Mapinguari"]
+
+def test_ranking():
+    # More mentions of the term rank higher
+    assert names("swamps") == ["Mapinguari", "Mokele-mbembe"]
+
+def test_every_word_must_match():
+    assert names("giant swamps") == ["Mapinguari"]
+    assert names("giant sauropod") == []
+
+def test_update_is_indexed():
+    creature.modify(samples[0].model_copy(update={"description": "River beast"}))
+
+    assert names("sauropod") == []
+    assert names("river") == ["Mokele-mbembe"]
+
+def test_no_words():
+    assert creature.search_text("   ") == ([], False)
+    assert creature.search_text("!?") == ([], False)
+
+def test_syntax_error(monkeypatch):
+    monkeypatch.setattr(search, "to_match", lambda q: q)
+
+    with pytest.raises(SearchException):
+        creature.search_text("AND")
+
+def test_rebuild():
+    with get_conn() as conn:
+        conn.execute("insert into creature_fts(creature_fts) values ('delete-all')")
+        conn.commit()
+    assert names("river") == []
+
+    search.rebuild("creature")
+    assert names("river") == ["Mokele-mbembe"]
+
+def test_delete_is_indexed():
+    for sample in samples:
+        creature.delete(sample.name)
+
+    assert names("river") == []
+    assert names("swamps") == []
@@ -0,0 +1,25 @@
+import os
+import pytest
+from model.explorer import Explorer
+
+os.environ["CRYPTID_SQLITE_DB"] = ":memory:"
+
+from data import explorer
+from data.errors import MissingException
+
+sample = Explorer(name="Roy Mackal", country="US", description="Biologist")
+
+def test_writes_bump_version():
+    before = explorer.get_version()
+    explorer.create(sample)
+    explorer.modify(sample)
+    explorer.delete(sample.name)
+
+    assert explorer.get_version() == before + 3
+
+def test_failed_write_keeps_version():
+    before = explorer.get_version()
+    with pytest.raises(MissingException):
+        explorer.delete(sample.name)
+
+    assert explorer.get_version() == before
@@ -0,0 +1,66 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+from time import sleep
+
+os.environ["CRYPTID_SQLITE_DB"] = ":memory:"
+
+import pytest
+from model.explorer import Explorer
+from data import explorer, writer
+from data.errors import DuplicateException, MissingException
+
+samples = [Explorer(name=f"Writer {n}", country="US", description="Tester")
+           for n in range(20)]
+
+@pytest.fixture
+def group_commit(monkeypatch):
+    monkeypatch.setattr(writer, "GROUP_COMMIT", True)
+    monkeypatch.setattr(writer, "GROUP_COMMIT_MS", 50)
+    yield
+    writer.stop()
+
+def outcome(fn, *args):
+    try:
+        return fn(*args)
+    except Exception as exc:
+        return exc
+
+def test_each_caller_gets_its_own_outcome(group_commit):
+    calls = [(explorer.create, sample) for sample in samples]
+    calls += [(explorer.create, samples[0]), (explorer.delete, "Nobody")]
+    with ThreadPoolExecutor(len(calls)) as pool:
+        results = list(pool.map(lambda call: outcome(*call), calls))
+
+    errors = [type(result) for result in results if isinstance(result, Exception)]
+    assert sorted(errors, key=str) == [DuplicateException, MissingException]
+    # The failed operations were undone without losing the rest
+    assert len(explorer.get_many([sample.name for sample in samples])) == len(samples)
+
+def test_cleanup(group_commit):
+    for sample in samples:
+        assert explorer.delete(sample.name)
+
+def test_stop_refuses_late_writes(group_commit):
+    # Hold the writer in its first operation until stop() is under way
+    started, release = Event(), Event()
+    def slow(conn):
+        started.set()
+        release.wait(5)
+        return "done"
+    with ThreadPoolExecutor(2) as pool:
+        first = pool.submit(writer.write, slow)
+        started.wait(5)
+        stopper = pool.submit(writer.stop)
+        while not writer._stopping:
+            sleep(0.001)
+        with pytest.raises(RuntimeError):
+            writer.write(slow)
+        release.set()
+        stopper.result(5)
+        # Queued before stop(), so still applied
+        assert first.result(5) == "done"
+    assert writer._queue.empty()
+    # The writer starts again for later writes
+    assert explorer.create(samples[0]) == samples[0]
+    assert explorer.delete(samples[0].name)
@@ -0,0 +1,42 @@
+from time import time
+from service.cache import TTLCache
+
+def test_get_set():
+    cache = TTLCache(maxsize=2)
+    cache.set("yeti", 1)
+    assert cache.get("yeti") == 1
+    assert cache.get("bigfoot") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+def test_lru_eviction():
+    cache = TTLCache(maxsize=2)
+    cache.set("yeti", 1)
+    cache.set("bigfoot", 2)
+    cache.get("yeti")
+    cache.set("nessie", 3)
+    assert cache.get("bigfoot") is None
+    assert cache.get("yeti") == 1
+    assert cache.stats()["evictions"] == 1
+
+def test_expires_at():
+    cache = TTLCache()
+    cache.set("yeti", 1, expires_at=time() - 1)
+    assert cache.get("yeti") is None
+    assert len(cache) == 0
+
+def test_pop():
+    cache = TTLCache(ttl=60)
+    cache.set("yeti", 1)
+    cache.pop("yeti")
+    assert cache.get("yeti") is None
+
+def test_set_skipped_after_invalidation():
+    cache = TTLCache(maxsize=2)
+    generation = cache.generation
+    cache.pop("yeti")
+    cache.set("yeti", "stale", generation=generation)
+    assert cache.get("yeti") is None
+
+    cache.set("yeti", "fresh", generation=cache.generation)
+    assert cache.get("yeti") == "fresh"
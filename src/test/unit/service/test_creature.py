@@ -18,4 +18,40 @@ def test_get_exists():
 
 def test_get_missing():
     resp = code.get_one("boxturtle")
-    assert resp is None
\ No newline at end of file
+    assert resp is None
+
+def test_get_many():
+    found, missing = code.get_many(["boxturtle", "Yeti", "Yeti"])
+    assert found == [sample]
+    assert missing == ["boxturtle"]
+
+def test_modify_evicts():
+    code.get_one("Yeti")
+    assert code.creature_cache.get("Yeti") == sample
+    changed = sample.model_copy(update={"area": "Nepal"})
+    code.modify(changed)
+
+    assert code.creature_cache.get("Yeti") is None
+    assert code.get_one("Yeti") == changed
+
+def test_stale_read_not_cached(monkeypatch):
+    # A write lands between the cache miss and the fill
+    read = code.data.get_one
+    def racing_read(name):
+        row = read(name)
+        code.modify(sample)
+        return row
+    code.creature_cache.clear()
+    monkeypatch.setattr(code.data, "get_one", racing_read)
+    code.get_one("Yeti")
+    monkeypatch.undo()
+
+    assert code.creature_cache.get("Yeti") is None
+    assert code.get_one("Yeti") == sample
+
+def test_delete_evicts():
+    code.get_one("Yeti")
+    code.delete("Yeti")
+
+    assert code.creature_cache.get("Yeti") is None
+
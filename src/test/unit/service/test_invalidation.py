@@ -0,0 +1,31 @@
+import os
+
+os.environ["CRYPTID_SQLITE_DB"] = ":memory:"
+
+import data.explorer as data
+from model.explorer import Explorer
+from service import explorer, invalidation
+
+sample = Explorer(name="Bernard Heuvelmans", country="BE",
+                  description="Father of cryptozoology")
+
+def test_other_worker_write_clears_cache():
+    invalidation.check(force=True)
+    explorer.create(sample)
+    assert explorer.get_one(sample.name) == sample
+
+    # Another worker writes straight to the shared database
+    changed = sample.model_copy(update={"country": "FR"})
+    data.modify(changed)
+    assert explorer.explorer_cache.get(sample.name) == sample
+
+    invalidation.check(force=True)
+    assert explorer.explorer_cache.get(sample.name) is None
+    assert explorer.get_one(sample.name) == changed
+
+def test_unchanged_tables_keep_cache():
+    invalidation.check(force=True)
+    explorer.get_one(sample.name)
+    invalidation.check(force=True)
+
+    assert explorer.explorer_cache.get(sample.name) is not None
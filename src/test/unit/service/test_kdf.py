@@ -0,0 +1,43 @@
+import pytest
+from service import kdf
+
+SALT = b"0123456789abcdef"
+
+@pytest.mark.parametrize("algorithm, params", [
+    ("pbkdf2_sha256", {"i": 1000}),
+    ("scrypt", {"n": 16, "r": 8, "p": 1}),
+])
+def test_round_trip(algorithm, params):
+    stored = kdf.hash_password("secret", SALT, algorithm, params)
+
+    assert kdf.parse(stored)[:2] == (algorithm, params)
+    assert kdf.verify("secret", SALT, stored)
+    assert not kdf.verify("Secret", SALT, stored)
+
+def test_legacy_hash():
+    legacy = kdf.derive("secret", SALT, "pbkdf2_sha256",
+                        {"i": kdf.LEGACY_ITERATIONS})
+
+    assert kdf.parse(legacy) == ("pbkdf2_sha256",
+                                 {"i": kdf.LEGACY_ITERATIONS}, legacy)
+    assert kdf.verify("secret", SALT, legacy)
+
+def test_needs_rehash(monkeypatch):
+    monkeypatch.setattr(kdf, "KDF", "scrypt")
+    monkeypatch.setattr(kdf, "SCRYPT_N", 16)
+    current = kdf.hash_password("secret", SALT, "scrypt")
+
+    assert not kdf.needs_rehash(current)
+    assert kdf.needs_rehash(current.replace("n=16", "n=8"))
+    assert kdf.needs_rehash(kdf.hash_password("secret", SALT, "pbkdf2_sha256"))
+
+@pytest.mark.parametrize("stored", [
+    "pbkdf2_sha256$i=1000",
+    "pbkdf2_sha256$i=1000$abc$def",
+    "pbkdf2_sha256$i$abc",
+    "pbkdf2_sha256$i=many$abc",
+    "pbkdf2_sha256$n=16$abc",
+    "md5$i=1$abc",
+])
+def test_malformed_hash_fails(stored):
+    assert not kdf.verify("secret", SALT, stored)
@@ -0,0 +1,29 @@
+import pytest
+from service import ratelimit
+from service.ratelimit import RateLimited, TokenBucket
+
+def test_burst_then_wait():
+    bucket = TokenBucket(rate=1, burst=2)
+
+    assert bucket.take("nessie") == 0
+    assert bucket.take("nessie") == 0
+    assert 0 < bucket.take("nessie") <= 1
+    assert bucket.take("champ") == 0
+
+def test_bounded():
+    bucket = TokenBucket(rate=1, burst=1, maxsize=2)
+    for key in ("a", "b", "c"):
+        bucket.take(key)
+
+    assert len(bucket._buckets) == 2
+    # "a" was evicted, so it starts again with a full bucket
+    assert bucket.take("a") == 0
+
+def test_check_login(monkeypatch):
+    monkeypatch.setattr(ratelimit, "user_limiter", TokenBucket(rate=1, burst=1))
+    monkeypatch.setattr(ratelimit, "ip_limiter", TokenBucket(rate=1, burst=10))
+    ratelimit.check_login("yeti", "10.0.0.1")
+    with pytest.raises(RateLimited) as exc:
+        ratelimit.check_login("yeti", "10.0.0.2")
+
+    assert exc.value.retry_after > 0
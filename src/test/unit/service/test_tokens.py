@@ -0,0 +1,57 @@
+from time import time
+import pytest
+from jose import jwt
+from service import tokens
+
+@pytest.fixture(autouse=True)
+def keyring(monkeypatch):
+    monkeypatch.setattr(tokens, "KEYS", {"k1": "old-secret", "k2": "new-secret"})
+    monkeypatch.setattr(tokens, "ACTIVE_KID", "k2")
+
+@pytest.mark.parametrize("backend", tokens.BACKENDS)
+def test_round_trip(backend):
+    exp = int(time()) + 60
+    token = tokens.encode("nessie", exp, backend=backend)
+
+    assert tokens.decode(token) == ("nessie", exp)
+
+@pytest.mark.parametrize("backend", tokens.BACKENDS)
+def test_rotation(monkeypatch, backend):
+    token = tokens.encode("nessie", int(time()) + 60, backend=backend)
+    monkeypatch.setattr(tokens, "ACTIVE_KID", "k1")
+    assert tokens.decode(token)
+
+    monkeypatch.setattr(tokens, "KEYS", {"k1": "old-secret"})
+    assert tokens.decode(token) is None
+
+@pytest.mark.parametrize("backend", tokens.BACKENDS)
+def test_expired(backend):
+    assert tokens.decode(tokens.encode("nessie", int(time()) - 1,
+                                       backend=backend)) is None
+
+def test_tampered():
+    token = tokens.encode("nessie", int(time()) + 60, backend="compact")
+    forged = token.replace(".bmVzc2ll.", ".Y2hhbXA.")
+
+    assert forged != token
+    assert tokens.decode(forged) is None
+
+@pytest.mark.parametrize("sig", ["éé", "\udcff"])
+def test_non_ascii_signature(sig):
+    token = tokens.encode("nessie", int(time()) + 60, backend="compact")
+    forged = token.rpartition(".")[0] + "." + sig
+
+    assert tokens.decode(forged) is None
+
+def test_unknown_kid():
+    token = jwt.encode({"sub": "nessie"}, "old-secret", algorithm=tokens.ALGORITHM)
+
+    # Tokens without a kid only check against the legacy key
+    assert tokens.decode(token) is None
+
+@pytest.mark.parametrize("backend", tokens.BACKENDS)
+def test_key_id(backend):
+    token = tokens.encode("nessie", int(time()) + 60, backend=backend)
+
+    assert tokens.key_id(token) == "k2"
+    assert tokens.key_id("not-a-token") is None
@@ -0,0 +1,71 @@
+import asyncio
+import os
+from time import time
+
+os.environ["CRYPTID_SQLITE_DB"] = ":memory:"
+
+import pytest
+from service import kdf, tokens, user as code
+from telemetry.metrics import AUTH_READS_SAVED
+
+@pytest.fixture(autouse=True)
+def fast_hash(monkeypatch):
+    monkeypatch.setattr(kdf, "PBKDF2_ITERATIONS", 1)
+
+def saved() -> float:
+    return AUTH_READS_SAVED._values.get((), 0)
+
+@pytest.mark.parametrize("backend", tokens.BACKENDS)
+def test_cached_token_retired_with_its_key(monkeypatch, backend):
+    monkeypatch.setattr(tokens, "KEYS", {"k1": "old-secret", "k2": "new-secret"})
+    monkeypatch.setattr(tokens, "ACTIVE_KID", "k1")
+    token = tokens.encode("nessie", int(time()) + 60, backend=backend)
+    assert code.get_jwt_username(token) == "nessie"
+
+    # Still cached, but k1 has left the keyring
+    monkeypatch.setattr(tokens, "KEYS", {"k2": "new-secret"})
+    assert code.get_jwt_username(token) is None
+
+def test_lookup_is_cached():
+    code.create("cadborosaurus", "secret")
+    before = saved()
+    first = code.lookup_user("cadborosaurus")
+    second = code.lookup_user("cadborosaurus")
+
+    assert second == first
+    assert saved() == before + 1
+
+def test_modify_invalidates():
+    code.lookup_user("cadborosaurus")
+    code.modify("cadborosaurus", "new-hash")
+
+    assert code.lookup_user("cadborosaurus").hashed_passwd == "new-hash"
+
+def test_login_rehashes_legacy_hash():
+    salt = b"0123456789abcdef"
+    legacy = kdf.derive("secret", salt, "pbkdf2_sha256",
+                        {"i": kdf.LEGACY_ITERATIONS})
+    code.modify_hash("cadborosaurus", legacy, salt)
+
+    user = code.auth_user("cadborosaurus", "secret")
+
+    assert user.hashed_passwd == "pbkdf2_sha256$i=1$" + user.hashed_passwd.split("$")[-1]
+    assert code.auth_user("cadborosaurus", "secret") == user
+
+def test_delete_invalidates():
+    code.lookup_user("cadborosaurus")
+    code.delete("cadborosaurus")
+
+    assert code.lookup_user("cadborosaurus") is None
+
+def test_login_rehash_async():
+    salt = b"0123456789abcdef"
+    code.create("ahool", "secret")
+    legacy = kdf.derive("secret", salt, "pbkdf2_sha256",
+                        {"i": kdf.LEGACY_ITERATIONS})
+    code.modify_hash("ahool", legacy, salt)
+
+    user = asyncio.run(code.auth_user_async("ahool", "secret"))
+
+    assert user.hashed_passwd.startswith("pbkdf2_sha256$i=1$")
+    code.delete("ahool")
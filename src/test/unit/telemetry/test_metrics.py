@@ -0,0 +1,36 @@
+from telemetry.metrics import Counter, Histogram, REGISTRY
+
+def test_counter():
+    counter = Counter("test_counter_total", "A counter", ("route",))
+    counter.inc(route="/creature")
+    counter.inc(2, route="/creature")
+    REGISTRY.remove(counter)
+
+    assert counter.render().splitlines() == [
+        "# HELP test_counter_total A counter",
+        "# TYPE test_counter_total counter",
+        'test_counter_total{route="/creature"} 3',
+    ]
+
+def test_counter_set_total():
+    counter = Counter("test_events_total", "Copied counts", ("event",))
+    counter.set_total(5, event="hits")
+    counter.set_total(7, event="hits")
+    REGISTRY.remove(counter)
+
+    assert list(counter.samples()) == ['test_events_total{event="hits"} 7']
+
+def test_histogram():
+    histogram = Histogram("test_seconds", "A histogram", buckets=(0.1, 1.0))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(5)
+    REGISTRY.remove(histogram)
+
+    assert list(histogram.samples()) == [
+        'test_seconds_bucket{le="0.1"} 1',
+        'test_seconds_bucket{le="1.0"} 2',
+        'test_seconds_bucket{le="+Inf"} 3',
+        "test_seconds_sum 5.55",
+        "test_seconds_count 3",
+    ]
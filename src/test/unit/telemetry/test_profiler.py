@@ -0,0 +1,61 @@
+import pstats
+from threading import Event, Thread
+import pytest
+from telemetry import profiler
+
+def spin(stop: Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+@pytest.fixture
+def profile_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiler, "PROFILE_DIR", tmp_path)
+    return tmp_path
+
+@pytest.fixture
+def doc(profile_dir, monkeypatch):
+    monkeypatch.setattr(profiler, "sampler", profiler.Sampler(interval_ms=1))
+    stop = Event()
+    busy = Thread(target=spin, args=(stop,))
+    profile = profiler.start()
+    profiler.record_sql("select  *\n from creature")
+    busy.start()
+    while not profile.counts:
+        stop.wait(0.01)
+    stop.set()
+    busy.join()
+    duration_ms = profiler.stop(profile)
+    profile_id = profiler.save(profile, duration_ms, method="GET",
+                               path="/creature", route="/creature")
+    return profiler.load(profile_id)
+
+def test_sample_cycle(doc):
+    assert doc["statements"] == ["select * from creature"]
+    assert any(frame[0] == "spin" for frame in doc["frames"])
+    assert profiler.list_profiles()[0]["id"] == doc["id"]
+
+def test_ring_buffer(profile_dir, monkeypatch):
+    monkeypatch.setattr(profiler, "KEEP", 2)
+    ids = [profiler.save(profiler.Profile(), 1.0) for _ in range(3)]
+
+    assert [doc["id"] for doc in profiler.list_profiles()] == ids[:0:-1]
+    assert profiler.load(ids[0]) is None
+
+def test_load_rejects_paths(profile_dir):
+    assert profiler.load("../etc/passwd") is None
+
+def test_speedscope(doc):
+    out = profiler.to_speedscope(doc)
+    sampled = out["profiles"][0]
+
+    assert len(out["shared"]["frames"]) == len(doc["frames"])
+    assert len(sampled["samples"]) == len(sampled["weights"]) == len(doc["stacks"])
+    assert sampled["endValue"] == sum(sampled["weights"])
+
+def test_pstats(doc, tmp_path):
+    path = tmp_path / "out.pstats"
+    path.write_bytes(profiler.to_pstats(doc))
+    stats = pstats.Stats(str(path))
+
+    assert any(func[2] == "spin" for func in stats.stats)
+    assert stats.total_tt > 0
@@ -0,0 +1,41 @@
+import os
+
+os.environ["CRYPTID_SQLITE_DB"] = ":memory:"
+
+import orjson
+from fastapi.testclient import TestClient
+from main import app
+from service import creature
+
+client = TestClient(app)
+
+def sample(name: str) -> dict:
+    return {"name": name, "description": "Bulk", "country": "XX",
+            "area": "Lab", "aka": ""}
+
+def test_json_array():
+    body = [sample("bulk-1"), sample("bulk-2"), {"name": "bulk-bad"}]
+    resp = client.post("/creature/bulk", json=body)
+
+    assert resp.status_code == 200
+    assert resp.json()["counts"] == {"created": 2, "invalid": 1}
+    assert [result["status"] for result in resp.json()["results"]] == [
+        "created", "created", "invalid"]
+
+def test_ndjson():
+    lines = [orjson.dumps(sample("bulk-1")), b"", b"not json",
+             orjson.dumps(sample("bulk-3"))]
+    resp = client.post("/creature/bulk?upsert=true", content=b"\n".join(lines),
+                       headers={"Content-Type": "application/x-ndjson"})
+
+    assert resp.status_code == 200
+    assert resp.json()["counts"] == {"updated": 1, "invalid": 1, "created": 1}
+
+def test_not_an_array():
+    resp = client.post("/creature/bulk", json={"name": "bulk-1"})
+
+    assert resp.status_code == 422
+
+def test_cleanup():
+    for name in ("bulk-1", "bulk-2", "bulk-3"):
+        assert creature.delete(name)
@@ -0,0 +1,86 @@
+import pytest
+
+pytest.importorskip("brotli")
+
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+from web.compression import CompressionMiddleware, compressed_cache
+from web.etag import matches, not_modified
+
+ETAG = '"creature-1-abc"'
+BIG = b"yeti " * 1000
+SMALL = b"yeti"
+
+app = FastAPI()
+app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+@app.get("/big")
+def big(request: Request):
+    if matches(request, ETAG):
+        return not_modified(ETAG)
+    return Response(BIG, headers={"ETag": ETAG})
+
+@app.get("/other")
+def other():
+    # Same ETag as /big, different body
+    return Response(BIG.upper(), headers={"ETag": ETAG})
+
+@app.get("/small")
+def small():
+    return Response(SMALL, headers={"ETag": ETAG})
+
+client = TestClient(app)
+
+def get(path: str, coding: str, **headers) -> Response:
+    return client.get(path, headers={"Accept-Encoding": coding, **headers})
+
+def test_gzip():
+    resp = get("/big", "gzip")
+
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.headers["etag"] == '"creature-1-abc-gzip"'
+    assert resp.headers["vary"] == "Accept-Encoding"
+    assert resp.content == BIG
+
+def test_br_preferred():
+    resp = get("/big", "gzip;q=0.5, br")
+
+    assert resp.headers["content-encoding"] == "br"
+    assert resp.headers["etag"] == '"creature-1-abc-br"'
+    assert resp.content == BIG
+
+def test_identity():
+    resp = get("/big", "identity")
+
+    assert "content-encoding" not in resp.headers
+    assert resp.headers["etag"] == ETAG
+    assert resp.headers["vary"] == "Accept-Encoding"
+
+def test_below_threshold():
+    resp = get("/small", "gzip")
+
+    assert "content-encoding" not in resp.headers
+    assert resp.headers["etag"] == ETAG
+    assert resp.headers["vary"] == "Accept-Encoding"
+    assert resp.content == SMALL
+
+def test_not_modified():
+    etag = get("/big", "gzip").headers["etag"]
+    resp = get("/big", "gzip", **{"If-None-Match": etag})
+
+    assert resp.status_code == 304
+    assert resp.headers["etag"] == etag
+    assert resp.headers["vary"] == "Accept-Encoding"
+
+def test_not_modified_identity_tag():
+    # The client got the identity form, say from a cache that stripped
+    # the encoding; it keeps that tag
+    resp = get("/big", "gzip", **{"If-None-Match": ETAG})
+
+    assert resp.status_code == 304
+    assert resp.headers["etag"] == ETAG
+
+def test_cache_key_includes_url():
+    compressed_cache.clear()
+    assert get("/big", "gzip").content == BIG
+    assert get("/other", "gzip").content == BIG.upper()
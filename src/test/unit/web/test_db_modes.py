@@ -0,0 +1,62 @@
+"""The same requests against the sync and the aiosqlite (CRYPTID_ASYNC_DB)
+routers, which must give the same API"""
+import os
+
+os.environ["CRYPTID_SQLITE_DB"] = ":memory:"
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+from main import create_app
+
+def sample(name: str, description: str = "Moded") -> dict:
+    return {"name": name, "description": description, "country": "ZZ",
+            "area": "Modes", "aka": ""}
+
+@pytest.fixture(params=["sync", "async"])
+def client(request, monkeypatch):
+    if request.param == "async":
+        monkeypatch.setenv("CRYPTID_ASYNC_DB", "1")
+    else:
+        monkeypatch.delenv("CRYPTID_ASYNC_DB", raising=False)
+    with TestClient(create_app()) as client:
+        for name in ("mode-a", "mode-b"):
+            assert client.post("/creature/", json=sample(name)).status_code == 200
+        yield client
+        for name in ("mode-a", "mode-b"):
+            client.delete(f"/creature/{name}")
+
+def test_names(client):
+    resp = client.get("/creature?names=mode-b,mode-a,mode-none")
+
+    assert resp.status_code == 200
+    assert [row["name"] for row in resp.json()["found"]] == ["mode-b", "mode-a"]
+    assert resp.json()["missing"] == ["mode-none"]
+
+def test_page_and_etag(client):
+    resp = client.get("/creature?country=ZZ&fields=name&limit=1")
+
+    assert resp.json() == [{"name": "mode-a"}]
+    assert "X-Next-Cursor" in resp.headers
+    again = client.get("/creature?country=ZZ&fields=name&limit=1",
+                       headers={"If-None-Match": resp.headers["ETag"]})
+    assert again.status_code == 304
+
+def test_item_write_is_seen_by_list(client):
+    client.get("/creature?names=mode-a")
+    resp = client.patch("/creature/", json=sample("mode-a", "Changed"))
+
+    assert resp.status_code == 200
+    found = client.get("/creature?names=mode-a").json()["found"]
+    assert found[0]["description"] == "Changed"
+
+def test_search_export_bulk(client):
+    assert client.get("/creature/search?q=moded").status_code == 200
+
+    resp = client.get("/creature/export", headers={"Accept-Encoding": "identity"})
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    names = {orjson.loads(line)["name"] for line in resp.text.splitlines()}
+    assert {"mode-a", "mode-b"} <= names
+
+    resp = client.post("/creature/bulk?upsert=true", json=[sample("mode-b")])
+    assert resp.json()["counts"] == {"updated": 1}
@@ -0,0 +1,53 @@
+import os
+
+os.environ["CRYPTID_SQLITE_DB"] = ":memory:"
+
+from fastapi.testclient import TestClient
+from main import app
+from model import Creature
+
+client = TestClient(app, headers={"Accept-Encoding": "identity"})
+
+sample = Creature(name="yeti", country="CN", area="Himalayas",
+                  description="Hirsute Himalayan", aka="Abominable Snowman")
+
+def test_create():
+    resp = client.post("/creature/", json=sample.model_dump())
+    assert resp.status_code == 200
+
+def test_item_and_list_tags_differ():
+    # The query string of the list equals the item's name
+    listed = client.get("/creature?yeti")
+    item = client.get("/creature/yeti")
+
+    assert listed.headers["etag"] != item.headers["etag"]
+    resp = client.get("/creature/yeti",
+                      headers={"If-None-Match": listed.headers["etag"]})
+    assert resp.status_code == 200
+
+def test_not_modified():
+    etag = client.get("/creature/yeti").headers["etag"]
+    resp = client.get("/creature/yeti", headers={"If-None-Match": etag})
+
+    assert resp.status_code == 304
+    assert resp.headers["etag"] == etag
+
+def test_star():
+    resp = client.get("/creature/yeti", headers={"If-None-Match": "*"})
+    assert resp.status_code == 304
+
+    # "*" matches any current representation, and a missing item has none
+    resp = client.get("/creature/nothere", headers={"If-None-Match": "*"})
+    assert resp.status_code == 404
+
+def test_write_changes_tag():
+    etag = client.get("/creature/yeti").headers["etag"]
+    changed = sample.model_copy(update={"area": "Nepal"})
+    client.patch("/creature/", json=changed.model_dump())
+    resp = client.get("/creature/yeti", headers={"If-None-Match": etag})
+
+    assert resp.status_code == 200
+    assert resp.json()["area"] == "Nepal"
+
+def test_cleanup():
+    assert client.delete("/creature/yeti").status_code == 200
@@ -0,0 +1,48 @@
+import gzip
+import os
+
+os.environ["CRYPTID_SQLITE_DB"] = ":memory:"
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+from model import Creature
+from service import creature
+
+client = TestClient(app)
+
+NAMES = [f"export-{n:02}" for n in range(25)]
+
+@pytest.fixture(scope="module", autouse=True)
+def samples():
+    creature.create_many([Creature(name=name, description="Exported",
+                                   country="XX", area="Lab", aka="")
+                          for name in NAMES])
+    yield
+    for name in NAMES:
+        creature.delete(name)
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    from data import paging
+    # Several chunks, so the export has to resume after each
+    monkeypatch.setattr(paging, "CHUNK_SIZE", 10)
+
+def test_export():
+    resp = client.get("/creature/export", headers={"Accept-Encoding": "identity"})
+    rows = [orjson.loads(line) for line in resp.content.splitlines()]
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    assert [row["name"] for row in rows] == NAMES
+    assert rows[0] == {"name": NAMES[0], "description": "Exported",
+                       "country": "XX", "area": "Lab", "aka": ""}
+
+def test_export_gzip():
+    with client.stream("GET", "/creature/export",
+                       headers={"Accept-Encoding": "gzip"}) as resp:
+        raw = b"".join(resp.iter_raw())
+
+    assert resp.headers["content-encoding"] == "gzip"
+    assert len(gzip.decompress(raw).splitlines()) == len(NAMES)
@@ -0,0 +1,25 @@
+import os
+
+os.environ["CRYPTID_SQLITE_DB"] = ":memory:"
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from main import app
+from web.paging import decode_cursor, encode_cursor
+
+@pytest.mark.parametrize("name", ["yeti", "Loch Ness Monster", "Ü?>~"])
+def test_cursor_round_trip(name):
+    assert decode_cursor(encode_cursor(name)) == name
+
+@pytest.mark.parametrize("cursor", ["é", "!!!!", "eWV0aQ=!", ""])
+def test_invalid_cursor(cursor):
+    with pytest.raises(HTTPException) as ex:
+        decode_cursor(cursor)
+
+    assert ex.value.status_code == 422
+
+def test_invalid_cursor_http():
+    resp = TestClient(app).get("/creature?next=%C3%A9")
+
+    assert resp.status_code == 422
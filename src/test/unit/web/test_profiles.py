@@ -0,0 +1,64 @@
+import os
+
+os.environ["CRYPTID_SQLITE_DB"] = ":memory:"
+
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+from service import user
+from telemetry import profiler
+
+client = TestClient(app)
+
+@pytest.fixture
+def auth():
+    token = user.create_access_token(data={"sub": "admin"})
+    return {"Authorization": f"Bearer {token}"}
+
+@pytest.fixture
+def profile_id(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiler, "PROFILE_DIR", tmp_path)
+    profile = profiler.Profile()
+    profile.add((("handler", "web/creature.py", 10),))
+    return profiler.save(profile, 12.5, method="GET", path="/creature",
+                         route="/creature")
+
+def test_missing_token():
+    assert client.get("/admin/profiles").status_code == 422
+
+def test_invalid_token():
+    resp = client.get("/admin/profiles",
+                      headers={"Authorization": "Bearer nonsense"})
+    assert resp.status_code == 401
+
+def test_list(auth, profile_id):
+    resp = client.get("/admin/profiles", headers=auth)
+
+    assert resp.status_code == 200
+    assert [doc["id"] for doc in resp.json()] == [profile_id]
+
+@pytest.mark.parametrize("format, media_type", [
+    ("speedscope", "application/json"),
+    ("json", "application/json"),
+    ("pstats", "application/octet-stream"),
+])
+def test_get_one(auth, profile_id, format, media_type):
+    resp = client.get(f"/admin/profiles/{profile_id}",
+                      params={"format": format}, headers=auth)
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == media_type
+
+def test_bad_format(auth, profile_id):
+    resp = client.get(f"/admin/profiles/{profile_id}",
+                      params={"format": "svg"}, headers=auth)
+    assert resp.status_code == 422
+
+def test_not_found(auth, profile_id):
+    resp = client.get("/admin/profiles/123", headers=auth)
+    assert resp.status_code == 404
+
+def test_get_one_needs_token(profile_id):
+    resp = client.get(f"/admin/profiles/{profile_id}",
+                      headers={"Authorization": "Bearer nonsense"})
+    assert resp.status_code == 401
@@ -0,0 +1,47 @@
+import os
+
+os.environ["CRYPTID_SQLITE_DB"] = ":memory:"
+
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+from service import kdf, ratelimit, user
+
+client = TestClient(app)
+
+@pytest.fixture(autouse=True)
+def fast_hash(monkeypatch):
+    monkeypatch.setattr(kdf, "PBKDF2_ITERATIONS", 1)
+    ratelimit.user_limiter.clear()
+    ratelimit.ip_limiter.clear()
+
+def login(name: str, passwd: str):
+    return client.post("/user/token", data={"username": name, "password": passwd})
+
+def test_unknown_user():
+    resp = login("nobody", "secret")
+
+    assert resp.status_code == 401
+    assert resp.json()["detail"] == "Incorrect username or password"
+
+def test_wrong_password():
+    user.create("ogopogo", "secret")
+    resp = login("ogopogo", "wrong")
+
+    assert resp.status_code == 401
+    assert resp.json() == login("nobody", "wrong").json()
+
+def test_login():
+    resp = login("ogopogo", "secret")
+
+    assert resp.status_code == 200
+    assert resp.json()["token_type"] == "bearer"
+
+def test_rate_limited(monkeypatch):
+    monkeypatch.setattr(ratelimit, "user_limiter",
+                        ratelimit.TokenBucket(rate=0.1, burst=1))
+    login("ogopogo", "wrong")
+    resp = login("ogopogo", "wrong")
+
+    assert resp.status_code == 429
+    assert int(resp.headers["retry-after"]) >= 1
@@ -0,0 +1,53 @@
+from fastapi import APIRouter, HTTPException
+from model.creature import Creature
+import data.aio.creature as service
+from service.creature import evict
+from data.errors import MissingException, DuplicateException
+
+router = APIRouter(prefix = "/creature")
+
+@router.get("/{name}")
+async def get_one(name) -> Creature:
+    try:
+        return await service.get_one(name)
+    except MissingException as ex:
+        raise HTTPException(
+            status_code=404,
+            detail=ex.msg
+        )
+
+@router.post("/")
+async def create(creature: Creature) -> Creature:
+    try:
+        return await service.create(creature)
+    except DuplicateException as ex:
+        raise HTTPException(
+            status_code=409,
+            detail=ex.msg
+        )
+    finally:
+        evict(creature.name)
+
+@router.patch("/")
+async def modify(creature: Creature) -> Creature:
+    try:
+        return await service.modify(creature)
+    except MissingException as ex:
+        raise HTTPException(
+            status_code=404,
+            detail=ex.msg
+        )
+    finally:
+        evict(creature.name)
+
+@router.delete("/{name}")
+async def delete(name: str):
+    try:
+        return await service.delete(name)
+    except MissingException as ex:
+        raise HTTPException(
+            status_code=404,
+            detail=ex.msg
+        )
+    finally:
+        evict(name)
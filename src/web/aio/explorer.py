@@ -0,0 +1,55 @@
+from fastapi import APIRouter, HTTPException
+from model.explorer import Explorer
+import data.aio.explorer as service
+from service.explorer import evict
+from data.errors import MissingException, DuplicateException
+
+router = APIRouter(
+    prefix="/explorer"
+)
+
+@router.get("/{name}")
+async def get_one(name: str) -> Explorer | None:
+    try:
+        return await service.get_one(name)
+    except MissingException as ex:
+        raise HTTPException(
+            status_code=404,
+            detail=ex.msg
+        )
+
+@router.post("/", status_code=201)
+async def create(explorer: Explorer) -> Explorer:
+    try:
+        return await service.create(explorer)
+    except DuplicateException as ex:
+        raise HTTPException(
+            status_code=409,
+            detail=ex.msg
+        )
+    finally:
+        evict(explorer.name)
+
+@router.patch("/")
+async def modify(explorer: Explorer) -> Explorer:
+    try:
+        return await service.modify(explorer)
+    except MissingException as ex:
+        raise HTTPException(
+            status_code=404,
+            detail=ex.msg
+        )
+    finally:
+        evict(explorer.name)
+
+@router.delete("/{name}")
+async def delete(name: str):
+    try:
+        return await service.delete(name)
+    except MissingException as ex:
+        raise HTTPException(
+            status_code=404,
+            detail=ex.msg
+        )
+    finally:
+        evict(name)
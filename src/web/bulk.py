@@ -0,0 +1,65 @@
+from collections import Counter
+from typing import Callable
+import orjson
+from fastapi import HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, ValidationError
+
+def parse_items(body: bytes, ndjson: bool) -> list:
+    """Return the items of a JSON array, or with <ndjson> NDJSON, <body>"""
+    if ndjson:
+        items = []
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                items.append(orjson.loads(line))
+            except orjson.JSONDecodeError:
+                items.append(line.decode(errors="replace"))
+        return items
+    try:
+        items = orjson.loads(body)
+    except orjson.JSONDecodeError:
+        items = None
+    if not isinstance(items, list):
+        raise HTTPException(
+            status_code=422,
+            detail="Body must be a JSON array or NDJSON"
+        )
+    return items
+
+def store_items(body: bytes, ndjson: bool, model: type[BaseModel],
+                create: Callable, upsert: bool) -> dict:
+    """Validate each item of <body> as a <model> and store the valid
+    ones with <create>; report a status for every item"""
+    results: list[dict | None] = []
+    valid = []
+    for item in parse_items(body, ndjson):
+        try:
+            valid.append((len(results), model.model_validate(item)))
+            results.append(None)
+        except ValidationError as exc:
+            results.append({
+                "name": item.get("name") if isinstance(item, dict) else None,
+                "status": "invalid",
+                "detail": exc.errors(include_url=False, include_context=False),
+            })
+
+    statuses = create([obj for _, obj in valid], upsert)
+    for (index, obj), status in zip(valid, statuses):
+        results[index] = {"name": obj.name, "status": status}
+
+    return {
+        "counts": Counter(result["status"] for result in results),
+        "results": results,
+    }
+
+async def create_many(request: Request, model: type[BaseModel],
+                      create: Callable, upsert: bool) -> dict:
+    """Store the items of a JSON array or NDJSON request body, like
+    store_items(). Parsing and validating a large body takes seconds,
+    so all of it runs in the threadpool, off the event loop."""
+    body = await request.body()
+    ndjson = "ndjson" in request.headers.get("content-type", "")
+    return await run_in_threadpool(store_items, body, ndjson, model,
+                                   create, upsert)
@@ -0,0 +1,136 @@
+"""Response compression with a cache of compressed bodies.
+
+Bodies of at least CRYPTID_COMPRESS_MIN_SIZE bytes are gzipped, or
+brotli-compressed if the brotli package is installed and the client
+prefers it. Responses that carry a strong ETag (which embeds the table
+version) are compressed once per URL and ETag and served from a cache
+after that, until a write bumps the version. Every response that could
+have been compressed carries Vary: Accept-Encoding.
+"""
+import gzip
+import os
+from service.cache import TTLCache
+from .encoding import accepted_encodings
+from .etag import encoded
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MIN_SIZE = int(os.getenv("CRYPTID_COMPRESS_MIN_SIZE", "1024"))
+CACHE_SIZE = int(os.getenv("CRYPTID_COMPRESS_CACHE_SIZE", "256"))
+GZIP_LEVEL = int(os.getenv("CRYPTID_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("CRYPTID_BROTLI_QUALITY", "5"))
+
+compressed_cache = TTLCache(maxsize=CACHE_SIZE)
+
+def choose(header: str | None) -> str | None:
+    """Pick the best coding we support from an Accept-Encoding <header>"""
+    codings = accepted_encodings(header)
+    supported = ["br", "gzip"] if brotli else ["gzip"]
+    best, best_q = None, 0.0
+    for coding in supported:
+        q = codings.get(coding, codings.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+def compress(body: bytes, coding: str) -> bytes:
+    if coding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+def add_vary(headers: list) -> list:
+    """Return response <headers> with Accept-Encoding in their Vary"""
+    vary = b", ".join(value for name, value in headers if name == b"vary")
+    if b"accept-encoding" in vary.lower() or vary.strip() == b"*":
+        return headers
+    return [(name, value) for name, value in headers if name != b"vary"] + [
+        (b"vary", vary + b", Accept-Encoding" if vary else b"Accept-Encoding")]
+
+def not_modified_etag(etag: str, coding: str, if_none_match: str) -> str:
+    """Return the ETag for a 304: the form the client holds, which is
+    the identity one if that response was too small to compress"""
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    if etag in tags and encoded(etag, coding) not in tags:
+        return etag
+    return encoded(etag, coding)
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = MIN_SIZE) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope["headers"])
+        coding = choose(headers.get(b"accept-encoding", b"").decode("latin-1"))
+        if not coding:
+            async def send_identity(message) -> None:
+                if message["type"] == "http.response.start":
+                    message["headers"] = add_vary(list(message.get("headers", [])))
+                await send(message)
+            await self.app(scope, receive, send_identity)
+            return
+
+        start = None
+        passthrough = False
+
+        async def send_compressed(message) -> None:
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            passthrough = True
+            body = message.get("body", b"")
+            response_headers = dict(start["headers"])
+            etag = response_headers.get(b"etag", b"").decode("latin-1")
+            if b"content-encoding" in response_headers:
+                # Already encoded, and sets its own Vary
+                await send(start)
+                await send(message)
+                return
+            start["headers"] = add_vary(list(start["headers"]))
+            if start["status"] == 304 and etag:
+                if_none_match = headers.get(b"if-none-match", b"").decode("latin-1")
+                self._set_etag(start, not_modified_etag(etag, coding, if_none_match))
+            if message.get("more_body") or len(body) < self.minimum_size:
+                # Streaming, or too small to bother
+                await send(start)
+                await send(message)
+                return
+
+            # The ETag only identifies a body together with the URL
+            key = ((scope["path"], scope["query_string"], etag, coding)
+                   if etag.startswith('"') else None)
+            if not key or (data := compressed_cache.get(key)) is None:
+                data = compress(body, coding)
+                if key:
+                    compressed_cache.set(key, data)
+            start["headers"] = [
+                (name, value) for name, value in start["headers"]
+                if name not in (b"content-length", b"etag")
+            ] + [
+                (b"content-encoding", coding.encode()),
+                (b"content-length", str(len(data)).encode()),
+            ]
+            if etag:
+                self._set_etag(start, encoded(etag, coding))
+            await send(start)
+            await send({"type": "http.response.body", "body": data})
+
+        await self.app(scope, receive, send_compressed)
+
+    @staticmethod
+    def _set_etag(start: dict, etag: str) -> None:
+        start["headers"] = [
+            (name, value) for name, value in start["headers"]
+            if name != b"etag"
+        ] + [(b"etag", etag.encode("latin-1"))]
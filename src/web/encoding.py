@@ -0,0 +1,56 @@
+import zlib
+from typing import Any, Iterable, Iterator
+import orjson
+from fastapi import Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+class ORJSONResponse(JSONResponse):
+    """JSON response serialized by orjson. Return one from an endpoint
+    to skip FastAPI's response model validation and encoding."""
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+def accepted_encodings(header: str | None) -> dict[str, float]:
+    """Parse an Accept-Encoding <header> into {coding: q}"""
+    codings = {}
+    for part in (header or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        codings[coding.strip().lower()] = q
+    return codings
+
+def accepts(request: Request, coding: str) -> bool:
+    """Return True if the client will take a <coding> response body"""
+    codings = accepted_encodings(request.headers.get("accept-encoding"))
+    return codings.get(coding, codings.get("*", 0.0)) > 0
+
+def ndjson_lines(chunks: Iterable[list[dict]]) -> Iterator[bytes]:
+    for rows in chunks:
+        yield b"".join(orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE)
+                       for row in rows)
+
+def gzip_stream(parts: Iterable[bytes]) -> Iterator[bytes]:
+    gz = zlib.compressobj(wbits=31)
+    for part in parts:
+        if (data := gz.compress(part)):
+            yield data
+    yield gz.flush()
+
+def ndjson_response(request: Request, chunks: Iterable[list[dict]]) -> StreamingResponse:
+    """Stream <chunks> of rows as newline-delimited JSON, gzipped if
+    the client accepts it"""
+    body = ndjson_lines(chunks)
+    headers = {"Vary": "Accept-Encoding"}
+    if accepts(request, "gzip"):
+        body = gzip_stream(body)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(body, media_type="application/x-ndjson",
+                             headers=headers)
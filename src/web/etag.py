@@ -0,0 +1,38 @@
+from hashlib import blake2b
+from fastapi import Request, Response
+
+def make_etag(table: str, version: int, *parts: str) -> str:
+    """Return a strong ETag for a response built from <table> at
+    <version>, varying by <parts>: the kind of resource ("list",
+    "item" or "search") first, so kinds never share a tag, then
+    what identifies it, such as the query string"""
+    digest = blake2b("\0".join(parts).encode(), digest_size=8).hexdigest()
+    return f'"{table}-{version}-{digest}"'
+
+CODINGS = ("gzip", "br")
+
+def encoded(etag: str, coding: str) -> str:
+    """Return the ETag of the <coding>-encoded form of a response, which
+    has to differ from the identity one to stay a strong validator"""
+    if not etag.startswith('"'):
+        return etag
+    return f'{etag[:-1]}-{coding}"'
+
+def decoded(etag: str) -> str:
+    """Undo encoded() on an ETag sent back by a client"""
+    for coding in CODINGS:
+        if etag.endswith(f'-{coding}"'):
+            return etag[:-len(coding) - 2] + '"'
+    return etag
+
+def matches(request: Request, etag: str) -> bool:
+    """Return True if the client's If-None-Match already has <etag>"""
+    if not (header := request.headers.get("if-none-match")):
+        return False
+    if header.strip() == "*":
+        return True
+    tags = [decoded(tag.strip().removeprefix("W/")) for tag in header.split(",")]
+    return etag in tags
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
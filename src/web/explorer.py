@@ -1,26 +1,84 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request
 from model.explorer import Explorer
-import data.explorer as service
-from data.errors import MissingException, DuplicateException
+import service.explorer as service
+from data.explorer import COLUMNS
+from data.errors import MissingException, DuplicateException, SearchException
+from . import bulk
+from .encoding import ORJSONResponse, ndjson_response
+from .etag import make_etag, matches, not_modified
+from .paging import (MAX_LIMIT, decode_cursor, parse_fields, parse_names,
+    next_headers, next_offset_headers)
 
 router = APIRouter(
     prefix="/explorer"
 )
+# Routes over the whole table, which main.py mounts ahead of <router>
+# in either database mode, so "/export" is not taken for a name
+collection_router = APIRouter(prefix="/explorer")
 
-@router.get("")
-@router.get("/")
-def get_all() -> list[Explorer]:
-    return service.get_all()
+@collection_router.get("", response_model=list[dict])
+@collection_router.get("/", response_model=list[dict])
+def get_all(request: Request,
+            limit: int | None = Query(None, ge=1, le=MAX_LIMIT),
+            next_: str | None = Query(None, alias="next"),
+            country: str | None = None,
+            fields: str | None = None,
+            names: str | None = None) -> ORJSONResponse:
+    """Page through all explorers, or with <names>, look up each of a
+    comma-separated list and return {"found": [...], "missing": [...]}"""
+    etag = make_etag("explorer", service.get_version(), "list", request.url.query)
+    if matches(request, etag):
+        return not_modified(etag)
+    if names is not None:
+        found, missing = service.get_many(parse_names(names))
+        return ORJSONResponse(
+            {"found": [obj.model_dump() for obj in found], "missing": missing},
+            headers={"ETag": etag})
+    rows, last = service.get_page(
+        after=decode_cursor(next_),
+        limit=limit,
+        fields=parse_fields(fields, COLUMNS),
+        country=country)
+    return ORJSONResponse(rows, headers={"ETag": etag, **next_headers(request, last)})
 
-@router.get("/{name}")
-def get_one(name: str) -> Explorer | None:
+@collection_router.get("/export")
+def export(request: Request):
+    """Stream every row as NDJSON"""
+    return ndjson_response(request, service.iter_chunks())
+
+@collection_router.get("/search", response_model=list[dict])
+def search(request: Request,
+           q: str = Query(min_length=1),
+           limit: int = Query(20, ge=1, le=MAX_LIMIT),
+           offset: int = Query(0, ge=0)) -> ORJSONResponse:
+    """Full-text search, best matches first"""
+    etag = make_etag("explorer", service.get_version(), "search", request.url.query)
+    if matches(request, etag):
+        return not_modified(etag)
     try:
-        return service.get_one(name)
+        rows, more = service.search_text(q, limit=limit, offset=offset)
+    except SearchException as ex:
+        raise HTTPException(
+            status_code=422,
+            detail=ex.msg
+        )
+    headers = next_offset_headers(request, offset + limit if more else None)
+    return ORJSONResponse(rows, headers={"ETag": etag, **headers})
+
+@router.get("/{name}", response_model=Explorer)
+def get_one(request: Request, name: str) -> ORJSONResponse:
+    etag = make_etag("explorer", service.get_version(), "item", name)
+    try:
+        explorer = service.get_one(name)
     except MissingException as ex:
         raise HTTPException(
             status_code=404,
             detail=ex.msg
         )
+    # Only after the lookup, since "*" matches only an existing item
+    if matches(request, etag):
+        return not_modified(etag)
+    return ORJSONResponse(explorer.model_dump(), headers={"ETag": etag})
 
 @router.post("/", status_code=201)
 def create(explorer: Explorer) -> Explorer:
@@ -32,6 +90,12 @@ def create(explorer: Explorer) -> Explorer:
             detail=ex.msg
         )
 
+@collection_router.post("/bulk")
+async def create_bulk(request: Request, upsert: bool = False) -> dict:
+    """Create (or with <upsert>, create or replace) every explorer in a
+    JSON array or NDJSON body, in one transaction"""
+    return await bulk.create_many(request, Explorer, service.create_many, upsert)
+
 @router.patch("/")
 def modify(explorer: Explorer) -> Explorer:
     try:
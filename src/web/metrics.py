@@ -0,0 +1,37 @@
+from anyio import to_thread
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from service import creature, explorer, hashing
+from service import user as user_service
+from .compression import compressed_cache
+from telemetry.metrics import (CACHE_EVENTS, CACHE_SIZE, HASH_POOL,
+    THREADPOOL_BUSY, THREADPOOL_SIZE, render)
+
+router = APIRouter()
+
+def collect() -> None:
+    """Copy point-in-time values and counts kept elsewhere into their
+    metrics before a scrape"""
+    limiter = to_thread.current_default_thread_limiter()
+    THREADPOOL_BUSY.set(limiter.borrowed_tokens)
+    THREADPOOL_SIZE.set(limiter.total_tokens)
+
+    for state, value in hashing.stats().items():
+        HASH_POOL.set(value, state=state)
+
+    caches = {
+        "creature": creature.cache_stats(),
+        "explorer": explorer.cache_stats(),
+        "token": user_service.token_cache.stats(),
+        "user": user_service.user_cache.stats(),
+        "compressed": compressed_cache.stats(),
+    }
+    for cache, stats in caches.items():
+        CACHE_SIZE.set(stats["size"], cache=cache)
+        for event in ("hits", "misses", "evictions"):
+            CACHE_EVENTS.set_total(stats[event], cache=cache, event=event)
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    collect()
+    return PlainTextResponse(render(), media_type="text/plain; version=0.0.4")
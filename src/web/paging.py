@@ -0,0 +1,59 @@
+from base64 import b64decode, urlsafe_b64encode
+from fastapi import HTTPException, Request
+
+MAX_LIMIT = 1000
+
+def encode_cursor(name: str) -> str:
+    return urlsafe_b64encode(name.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str | None) -> str | None:
+    """Return the name a <cursor> from a previous page points after"""
+    if cursor is None:
+        return None
+    try:
+        # Strict, so stray characters are refused rather than dropped
+        name = b64decode(cursor + "=" * (-len(cursor) % 4), altchars=b"-_",
+                         validate=True).decode()
+    except ValueError:
+        # Including binascii.Error, UnicodeDecodeError and non-ASCII input
+        name = ""
+    if not name:
+        raise HTTPException(status_code=422, detail="Invalid page cursor")
+    return name
+
+def parse_fields(fields: str | None, columns: tuple[str, ...]) -> list[str] | None:
+    """Split a comma-separated <fields> list, rejecting unknown columns"""
+    if not fields:
+        return None
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    if (unknown := [name for name in names if name not in columns]):
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown fields: {', '.join(unknown)}"
+        )
+    return names
+
+def parse_names(names: str) -> list[str]:
+    """Split a comma-separated <names> list, allowing at most MAX_LIMIT"""
+    names = [name.strip() for name in names.split(",") if name.strip()]
+    if len(names) > MAX_LIMIT:
+        raise HTTPException(
+            status_code=422,
+            detail=f"At most {MAX_LIMIT} names per request"
+        )
+    return names
+
+def next_headers(request: Request, last: str | None) -> dict:
+    """Return headers pointing the client at the page after <last>"""
+    if last is None:
+        return {}
+    cursor = encode_cursor(last)
+    url = request.url.include_query_params(next=cursor)
+    return {"X-Next-Cursor": cursor, "Link": f'<{url}>; rel="next"'}
+
+def next_offset_headers(request: Request, offset: int | None) -> dict:
+    """Return headers pointing the client at the page starting at <offset>"""
+    if offset is None:
+        return {}
+    url = request.url.include_query_params(offset=offset)
+    return {"Link": f'<{url}>; rel="next"'}
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import Response
+from telemetry import profiler
+from .user import is_valid_token
+
+router = APIRouter(prefix="/admin/profiles")
+
+def check_token(valid_token: bool = Depends(is_valid_token)) -> None:
+    if not valid_token:
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid authorization bearer token"
+        )
+
+@router.get("", dependencies=[Depends(check_token)])
+@router.get("/", dependencies=[Depends(check_token)])
+def get_all() -> list[dict]:
+    """List stored request profiles, newest first"""
+    return profiler.list_profiles()
+
+@router.get("/{profile_id}", dependencies=[Depends(check_token)])
+def get_one(profile_id: str, format: str = "speedscope"):
+    """Download a profile as speedscope JSON, pstats or our raw JSON"""
+    if not (doc := profiler.load(profile_id)):
+        raise HTTPException(
+            status_code=404,
+            detail=f"Profile {profile_id} not found"
+        )
+    if format == "pstats":
+        return Response(
+            profiler.to_pstats(doc),
+            media_type="application/octet-stream",
+            headers={"Content-Disposition":
+                     f'attachment; filename="{profile_id}.pstats"'})
+    if format == "speedscope":
+        return profiler.to_speedscope(doc)
+    if format == "json":
+        return doc
+    raise HTTPException(
+        status_code=422,
+        detail="format must be speedscope, pstats or json"
+    )
@@ -1,4 +1,5 @@
 from datetime import timedelta
+import math
 import os
 from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
@@ -10,6 +11,8 @@ if os.getenv("CRYPTID_UNIT_TEST"):
 else:
     from service import user as service
 from data.errors import MissingException, DuplicateException
+from service.hashing import HashPoolBusy
+from service.ratelimit import RateLimited
 
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
@@ -101,13 +104,28 @@ def unauthed():
         headers={"WWW-Authenticate": "Bearer"},
         )
 
+def too_many(msg: str, retry_after: float):
+    raise HTTPException(
+        status_code=429,
+        detail=msg,
+        headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
 @router.post("/token")
 async def create_access_token(
+    request: Request,
     form_data: OAuth2PasswordRequestForm =  Depends()
 ):
     """Get username and password from OAuth form,
         return access token"""
-    user = service.auth_user(form_data.username, form_data.password)
+    client = request.client.host if request.client else None
+    try:
+        user = await service.auth_user_async(
+            form_data.username, form_data.password, client=client)
+    except RateLimited as exc:
+        too_many(exc.msg, exc.retry_after)
+    except HashPoolBusy as exc:
+        too_many(exc.msg, 1)
     if not user:
         unauthed()
     expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -116,8 +134,10 @@ async def create_access_token(
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
-from main import app
-@app.post("/token")
+# /token sits at the top level, outside the /user prefix
+token_router = APIRouter()
+
+@token_router.post("/token")
 def get_access_token(token: str = Depends(oauth2_dep)) -> dict:
     """Return the current access token"""
     return {"token": token}
\ No newline at end of file